@@ -0,0 +1,417 @@
+#!/usr/bin/env python3
+"""Offline benchmark for the Downdetector integration.
+
+Runs the API client (and optionally the coordinator) against a local
+stand-in for the Downdetector API, and reports the requests per refresh
+cycle, the p50/p99 refresh latency and the event loop blocking time for
+several numbers of services.
+
+Usage:
+    python benchmark.py [--sizes 1,10,100,500] [--cycles 5] [--latency 0.05]
+                        [--error-rate 0.01] [--unauthorized-rate 0.01]
+                        [--throttle-rate 0.01] [--no-rate-limit] [--coordinator]
+
+Only aiohttp is needed for the client benchmark. --coordinator also runs
+DowndetectorDataUpdateCoordinator passes, which needs Home Assistant.
+"""
+import argparse
+import asyncio
+from collections import Counter
+import hashlib
+import importlib
+import importlib.util
+import json
+from pathlib import Path
+import random
+import sys
+import tempfile
+import time
+import uuid
+
+from aiohttp import web
+import aiohttp
+
+COMPONENT_PATH = Path(__file__).parent / "custom_components"
+CLIENT_ID = "benchmark"
+CLIENT_SECRET = "benchmark-secret"
+
+
+class MockDowndetectorApi:
+    """Local stand-in for the Downdetector API.
+
+    Implements /tokens, /companies/search, /companies, /companies/{id},
+    /companies/{id}/last_15 and /ping. Every request waits for the
+    configured latency, and a share of them fails with a server error, a
+    revoked token (401) or rate limiting (429 with Retry-After).
+    """
+
+    def __init__(
+        self,
+        companies: int,
+        latency: float,
+        jitter: float,
+        error_rate: float,
+        unauthorized_rate: float,
+        throttle_rate: float,
+    ) -> None:
+        """Initialize the mock API."""
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.unauthorized_rate = unauthorized_rate
+        self.throttle_rate = throttle_rate
+        self.requests: Counter = Counter()
+        self.responses: Counter = Counter()
+        self._tokens: set[str] = set()
+        self._companies = {
+            str(company_id): {
+                "id": company_id,
+                "name": f"Service {company_id}",
+                "slug": f"service-{company_id}",
+                "status": "warning" if company_id % 20 == 0 else "success",
+                "baseline": 10,
+                "baseline_current": 10 + company_id % 7,
+                "stats_24": [random.randint(0, 20) for _ in range(96)],
+            }
+            for company_id in range(1, companies + 1)
+        }
+        self._runner: web.AppRunner | None = None
+        self.url = ""
+
+    async def start(self) -> None:
+        """Start serving on a free local port."""
+        app = web.Application(middlewares=[self._middleware])
+        app.router.add_post("/tokens", self._tokens_handler)
+        app.router.add_get("/ping", self._ping_handler)
+        app.router.add_get("/companies/search", self._search_handler)
+        app.router.add_get("/companies", self._companies_handler)
+        app.router.add_get("/companies/{company_id}", self._company_handler)
+        app.router.add_get("/companies/{company_id}/last_15", self._last_15_handler)
+
+        self._runner = web.AppRunner(app)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, "127.0.0.1", 0)
+        await site.start()
+        port = site._server.sockets[0].getsockname()[1]
+        self.url = f"http://127.0.0.1:{port}"
+
+    async def stop(self) -> None:
+        """Stop serving."""
+        if self._runner:
+            await self._runner.cleanup()
+
+    def reset_counters(self) -> None:
+        """Forget the requests counted so far."""
+        self.requests.clear()
+        self.responses.clear()
+
+    @web.middleware
+    async def _middleware(self, request: web.Request, handler) -> web.StreamResponse:
+        """Apply latency, error injection and authentication to a request."""
+        resource = request.match_info.route.resource
+        endpoint = resource.canonical if resource else request.path
+        self.requests[endpoint] += 1
+
+        await asyncio.sleep(max(random.gauss(self.latency, self.jitter), 0))
+
+        if random.random() < self.error_rate:
+            response = web.json_response({"error": "injected"}, status=500)
+        elif random.random() < self.throttle_rate:
+            response = web.json_response(
+                {"error": "rate limited"}, status=429, headers={"Retry-After": "1"}
+            )
+        elif endpoint != "/tokens" and not self._authorized(request):
+            response = web.json_response({"error": "unauthorized"}, status=401)
+        else:
+            response = await handler(request)
+
+        self.responses[response.status] += 1
+        return response
+
+    def _authorized(self, request: web.Request) -> bool:
+        """Return whether a request carries a valid token, revoking some."""
+        token = request.headers.get("Authorization", "").removeprefix("Bearer ")
+        if token not in self._tokens:
+            return False
+        if random.random() < self.unauthorized_rate:
+            self._tokens.discard(token)
+            return False
+        return True
+
+    @staticmethod
+    def _json(request: web.Request, data) -> web.Response:
+        """Return a JSON response with an ETag, or 304 if it still matches."""
+        body = json.dumps(data).encode()
+        etag = f'"{hashlib.sha1(body).hexdigest()}"'
+        if request.headers.get("If-None-Match") == etag:
+            return web.Response(status=304, headers={"ETag": etag})
+        return web.Response(
+            body=body, content_type="application/json", headers={"ETag": etag}
+        )
+
+    def _project(self, company: dict, fields: str | None) -> dict:
+        """Return the requested fields of a company."""
+        if not fields:
+            return company
+        return {field: company[field] for field in fields.split(",") if field in company}
+
+    async def _tokens_handler(self, request: web.Request) -> web.Response:
+        token = uuid.uuid4().hex
+        self._tokens.add(token)
+        return web.json_response({"access_token": token, "expires_in": 3600})
+
+    async def _ping_handler(self, request: web.Request) -> web.Response:
+        return web.json_response({})
+
+    async def _search_handler(self, request: web.Request) -> web.Response:
+        query = request.query.get("name", "").casefold()
+        return web.json_response(
+            [
+                {"id": company["id"], "name": company["name"], "slug": company["slug"]}
+                for company in self._companies.values()
+                if query in company["name"].casefold()
+            ][:25]
+        )
+
+    async def _companies_handler(self, request: web.Request) -> web.Response:
+        fields = request.query.get("fields")
+        return self._json(
+            request,
+            [
+                self._project(company, fields)
+                for company_id in request.query.get("ids", "").split(",")
+                if (company := self._companies.get(company_id))
+            ],
+        )
+
+    async def _company_handler(self, request: web.Request) -> web.Response:
+        if (company := self._companies.get(request.match_info["company_id"])) is None:
+            return web.json_response({"error": "not found"}, status=404)
+        return self._json(request, self._project(company, request.query.get("fields")))
+
+    async def _last_15_handler(self, request: web.Request) -> web.Response:
+        if (company := self._companies.get(request.match_info["company_id"])) is None:
+            return web.json_response({"error": "not found"}, status=404)
+        return web.json_response(company["baseline_current"] + random.randint(-3, 3))
+
+
+class LoopMonitor:
+    """Measure how long the event loop is blocked.
+
+    A task sleeps for a short interval in a loop; any extra delay before it
+    wakes up is time the loop spent running something else without yielding.
+    """
+
+    def __init__(self, interval: float = 0.005, threshold: float = 0.01) -> None:
+        """Initialize the monitor."""
+        self.interval = interval
+        self.threshold = threshold
+        self.blocked = 0.0
+        self.max_lag = 0.0
+        self._task: asyncio.Task | None = None
+
+    def start(self) -> None:
+        """Start measuring."""
+        self.blocked = 0.0
+        self.max_lag = 0.0
+        self._task = asyncio.ensure_future(self._run())
+
+    async def stop(self) -> None:
+        """Stop measuring."""
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            start = loop.time()
+            await asyncio.sleep(self.interval)
+            lag = loop.time() - start - self.interval
+            self.max_lag = max(self.max_lag, lag)
+            if lag > self.threshold:
+                self.blocked += lag
+
+
+def percentile(values: list[float], percent: float) -> float:
+    """Return the nearest-rank percentile of some values."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(int(round(percent / 100 * len(ordered) + 0.5)) - 1, 0)
+    return ordered[min(rank, len(ordered) - 1)]
+
+
+def load_api_module(coordinator: bool):
+    """Return the integration's api module.
+
+    Without Home Assistant, api.py is loaded on its own, as it only depends
+    on aiohttp; importing it through the package would import Home
+    Assistant.
+    """
+    if coordinator:
+        sys.path.insert(0, str(COMPONENT_PATH))
+        return importlib.import_module("downdetector.api")
+
+    path = COMPONENT_PATH / "downdetector" / "api.py"
+    spec = importlib.util.spec_from_file_location("downdetector_api", path)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[spec.name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+async def create_hass(config_dir: str):
+    """Return a minimal Home Assistant instance for the coordinator."""
+    from homeassistant.core import HomeAssistant
+
+    try:
+        hass = HomeAssistant(config_dir)
+    except TypeError:
+        # Releases before 2024.3 take no config directory
+        hass = HomeAssistant()
+        hass.config.config_dir = config_dir
+    return hass
+
+
+async def run_scenario(api, server: MockDowndetectorApi, count: int, args) -> dict:
+    """Run refresh cycles for some services and return their measurements."""
+    company_ids = [str(company_id) for company_id in range(1, count + 1)]
+    monitor = LoopMonitor()
+    latencies: list[float] = []
+    failures = 0
+    requests_per_cycle: list[int] = []
+
+    async with aiohttp.ClientSession() as session:
+        client = api.DowndetectorApiClient(session, CLIENT_ID, CLIENT_SECRET)
+        # As a hub client does
+        client.start_token_refresh()
+        if args.no_rate_limit:
+            client.set_rate_limit(rate=1e9, burst=10**9)
+
+        hass = coordinator = None
+        try:
+            if args.coordinator:
+                from downdetector.coordinator import DowndetectorDataUpdateCoordinator
+
+                hass = await create_hass(tempfile.mkdtemp())
+                coordinator = DowndetectorDataUpdateCoordinator(hass, client)
+                for company_id in company_ids:
+                    coordinator.async_add_service(company_id, f"Service {company_id}", {})
+
+            # Warm up: the token request is not part of the cycles
+            await client.test_connection()
+            server.reset_counters()
+            monitor.start()
+
+            for _ in range(args.cycles):
+                # Company details would have expired between real polls
+                client.clear_response_cache()
+                before = sum(server.requests.values())
+                start = time.perf_counter()
+                try:
+                    if coordinator:
+                        coordinator.async_make_all_due()
+                        await coordinator.async_refresh()
+                        if not coordinator.last_update_success:
+                            failures += 1
+                    else:
+                        await client.get_companies_status(company_ids)
+                except Exception as err:
+                    print(f"  cycle failed: {err}")
+                    failures += 1
+                latencies.append(time.perf_counter() - start)
+                requests_per_cycle.append(sum(server.requests.values()) - before)
+
+            await monitor.stop()
+        finally:
+            client.close()
+            if coordinator:
+                await coordinator.async_shutdown()
+            if hass:
+                await hass.async_stop()
+
+    return {
+        "services": count,
+        "requests_per_cycle": sum(requests_per_cycle) / len(requests_per_cycle),
+        "p50": percentile(latencies, 50),
+        "p99": percentile(latencies, 99),
+        "blocked": monitor.blocked,
+        "max_lag": monitor.max_lag,
+        "failures": failures,
+        "endpoints": dict(server.requests),
+        "statuses": dict(server.responses),
+        "conditional_hits": client.conditional_hits,
+    }
+
+
+async def main(args) -> int:
+    """Run the benchmark for every size and print a summary."""
+    api = load_api_module(args.coordinator)
+    sizes = [int(size) for size in args.sizes.split(",")]
+
+    server = MockDowndetectorApi(
+        max(sizes),
+        args.latency,
+        args.jitter,
+        args.error_rate,
+        args.unauthorized_rate,
+        args.throttle_rate,
+    )
+    await server.start()
+    api.API_BASE_URL = server.url
+
+    results = []
+    try:
+        for count in sizes:
+            print(f"Running {args.cycles} cycles with {count} services...")
+            results.append(await run_scenario(api, server, count, args))
+    finally:
+        await server.stop()
+
+    print("\n" + "=" * 78)
+    print("BENCHMARK SUMMARY")
+    print("=" * 78)
+    print(
+        f"{'Services':>8} {'Req/cycle':>10} {'p50 (s)':>9} {'p99 (s)':>9} "
+        f"{'Blocked (ms)':>13} {'Max lag (ms)':>13} {'Failed':>7}"
+    )
+    for result in results:
+        print(
+            f"{result['services']:>8} {result['requests_per_cycle']:>10.1f} "
+            f"{result['p50']:>9.3f} {result['p99']:>9.3f} "
+            f"{result['blocked'] * 1000:>13.1f} {result['max_lag'] * 1000:>13.1f} "
+            f"{result['failures']:>7}"
+        )
+
+    if args.verbose:
+        for result in results:
+            print(f"\n{result['services']} services:")
+            print(f"  Requests by endpoint: {result['endpoints']}")
+            print(f"  Responses by status: {result['statuses']}")
+            print(f"  Conditional hits: {result['conditional_hits']}")
+
+    return 0
+
+
+def parse_args() -> argparse.Namespace:
+    """Parse the command line."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", default="1,10,100,500", help="Comma separated service counts")
+    parser.add_argument("--cycles", type=int, default=5, help="Refresh cycles per size")
+    parser.add_argument("--latency", type=float, default=0.05, help="Mean response latency (s)")
+    parser.add_argument("--jitter", type=float, default=0.01, help="Latency standard deviation (s)")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Share of 500 responses")
+    parser.add_argument("--unauthorized-rate", type=float, default=0.0, help="Share of revoked tokens (401)")
+    parser.add_argument("--throttle-rate", type=float, default=0.0, help="Share of 429 responses")
+    parser.add_argument("--no-rate-limit", action="store_true", help="Disable the client's rate limiter")
+    parser.add_argument("--coordinator", action="store_true", help="Run coordinator passes (needs Home Assistant)")
+    parser.add_argument("--verbose", action="store_true", help="Print requests by endpoint and status")
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main(parse_args())))
@@ -1,44 +1,283 @@
 """The Downdetector integration."""
 from __future__ import annotations
 
+from datetime import date
+import hashlib
 import logging
+from typing import Any
 
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.const import Platform
-from homeassistant.core import HomeAssistant
+from homeassistant.const import EVENT_HOMEASSISTANT_CLOSE, Platform
+from homeassistant.core import Event, HomeAssistant, callback
 from homeassistant.helpers.aiohttp_client import async_get_clientsession
+from homeassistant.helpers.event import async_call_later
+from homeassistant.helpers.storage import Store
+from homeassistant.util.ssl import client_context
 
-from .api import DowndetectorApiClient
-from .const import CONF_CLIENT_ID, CONF_CLIENT_SECRET, DOMAIN
+from .api import DEFAULT_TIMEOUT, DowndetectorApiClient, create_session
+from .const import (
+    CONF_CLIENT_ID,
+    CONF_CLIENT_SECRET,
+    CONF_DAILY_BUDGET,
+    CONF_DEDICATED_SESSION,
+    CONF_SERVICE_ID,
+    CONF_SERVICE_NAME,
+    DATA_HUBS,
+    DATA_TOKEN_STORE,
+    DOMAIN,
+    STORAGE_KEY_TOKENS,
+    STORAGE_VERSION,
+    TOKEN_SAVE_DELAY,
+)
+from .coordinator import DowndetectorDataUpdateCoordinator
+from .history import ReportHistory
+from .statistics import async_clear_report_statistics
 
 _LOGGER = logging.getLogger(__name__)
 
-PLATFORMS: list[Platform] = [Platform.SENSOR]
+PLATFORMS: list[Platform] = [Platform.BINARY_SENSOR, Platform.SENSOR]
+
+
+def _secret_hash(client_secret: str) -> str:
+    """Return a hash identifying a client secret without revealing it."""
+    return hashlib.sha256(client_secret.encode()).hexdigest()
+
+
+def _client_key(client_id: str, client_secret: str) -> str:
+    """Return the registry key for a set of API credentials.
+
+    The secret is hashed so it never appears in hass.data keys or logs.
+    """
+    return f"{client_id}:{_secret_hash(client_secret)}"
+
+
+async def _async_get_token_store(hass: HomeAssistant) -> tuple[Store, dict[str, dict[str, Any]]]:
+    """Return the persisted token store and its data, loading it once."""
+    if DATA_TOKEN_STORE not in hass.data[DOMAIN]:
+        hass.data[DOMAIN][DATA_TOKEN_STORE] = hass.async_create_task(
+            _async_load_token_store(hass)
+        )
+    return await hass.data[DOMAIN][DATA_TOKEN_STORE]
+
+
+async def _async_load_token_store(hass: HomeAssistant) -> tuple[Store, dict[str, dict[str, Any]]]:
+    """Load the persisted tokens."""
+    store = Store(hass, STORAGE_VERSION, STORAGE_KEY_TOKENS)
+    return store, await store.async_load() or {}
+
+
+@callback
+def _async_setup_client_persistence(
+    client: DowndetectorApiClient,
+    secret_hash: str,
+    store: Store,
+    tokens: dict[str, dict[str, Any]],
+) -> None:
+    """Restore the client's persisted token and request budget, and persist them.
+
+    Both are keyed by client ID. Only a hash of the secret is stored, to
+    ignore a token that was obtained with different credentials. The
+    budget's count is restored for any secret, as the API counts requests
+    per client.
+    """
+    stored = tokens.setdefault(client.client_id, {})
+    if stored.get("access_token") and stored.get("secret_hash") == secret_hash:
+        client.restore_token(stored["access_token"], stored["expires_at"])
+    if stored.get("budget_day"):
+        try:
+            day = date.fromisoformat(stored["budget_day"])
+        except (TypeError, ValueError):
+            pass
+        else:
+            client.budget.restore(day, stored.get("budget_used", 0))
+
+    @callback
+    def _async_save_token(token: str, expires_at: float) -> None:
+        stored.update(
+            access_token=token,
+            expires_at=expires_at,
+            secret_hash=secret_hash,
+        )
+        store.async_delay_save(lambda: tokens, TOKEN_SAVE_DELAY)
+
+    @callback
+    def _async_save_budget(day: date, used: int) -> None:
+        stored.update(budget_day=day.isoformat(), budget_used=used)
+        store.async_delay_save(lambda: tokens, TOKEN_SAVE_DELAY)
+
+    client.token_listener = _async_save_token
+    client.budget.listener = _async_save_budget
+
+
+async def _async_acquire_hub(hass: HomeAssistant, entry: ConfigEntry) -> tuple[str, dict[str, Any]]:
+    """Return the shared hub for the entry's credentials.
+
+    Entries using the same credentials share one hub: one API client, and
+    therefore one token cache and one token lock, plus one coordinator that
+    polls all of their services together. The hub is reference-counted by the
+    config entries using it. A new hub's client starts with the token
+    persisted from a previous run, if it is still valid.
+    """
+    client_id = entry.data[CONF_CLIENT_ID]
+    client_secret = entry.data[CONF_CLIENT_SECRET]
+    key = _client_key(client_id, client_secret)
+    store, tokens = await _async_get_token_store(hass)
+    hubs: dict[str, dict[str, Any]] = hass.data[DOMAIN].setdefault(DATA_HUBS, {})
+
+    if key not in hubs:
+        session = async_get_clientsession(hass)
+        client = DowndetectorApiClient(session, client_id, client_secret)
+        _async_setup_client_persistence(client, _secret_hash(client_secret), store, tokens)
+        # The hub lives as long as its entries, so it keeps its token fresh
+        client.start_token_refresh()
+        hub = hubs[key] = {
+            "client": client,
+            "coordinator": DowndetectorDataUpdateCoordinator(hass, client),
+            "entries": set(),
+            # Entry providing the hub-level diagnostic entities, claimed by
+            # the first entry whose sensor platform is set up
+            "owner": None,
+            # Per entry, a callback adding the hub-level entities to it
+            "add_hub_entities": {},
+            # Tuned session owned by the hub, when enabled in the options
+            "session": None,
+        }
+
+        async def _async_close_session(event: Event) -> None:
+            """Close the dedicated session, as entries are not unloaded on stop."""
+            if hub["session"] is not None:
+                await hub["session"].close()
+
+        hub["remove_close_listener"] = hass.bus.async_listen_once(
+            EVENT_HOMEASSISTANT_CLOSE, _async_close_session
+        )
+        _LOGGER.debug("Created shared hub for client_id %s", client_id)
+
+    hubs[key]["entries"].add(entry.entry_id)
+    _async_apply_hub_options(hass, hubs[key])
+    return key, hubs[key]
+
+
+def _async_release_hub(hass: HomeAssistant, key: str, entry_id: str) -> None:
+    """Release the entry's reference to a shared hub."""
+    hubs: dict[str, dict[str, Any]] = hass.data[DOMAIN].get(DATA_HUBS, {})
+    if (hub := hubs.get(key)) is None:
+        return
+
+    hub["entries"].discard(entry_id)
+    hub["add_hub_entities"].pop(entry_id, None)
+    if not hub["entries"]:
+        hubs.pop(key)
+        hub["remove_close_listener"]()
+        hass.async_create_task(hub["coordinator"].async_shutdown())
+        hub["client"].close()
+        if hub["session"]:
+            hass.async_create_task(hub["session"].close())
+        _LOGGER.debug("Released last reference to shared hub")
+        return
+
+    if hub["owner"] == entry_id:
+        # Move the hub-level entities to a loaded entry, without reloading it.
+        # Without one, the next entry whose sensor platform is set up claims them.
+        hub["owner"] = None
+        if hub["add_hub_entities"]:
+            hub["owner"], add_hub_entities = next(iter(hub["add_hub_entities"].items()))
+            add_hub_entities()
+    _async_apply_hub_options(hass, hub)
+
+
+@callback
+def _async_apply_hub_options(hass: HomeAssistant, hub: dict[str, Any]) -> None:
+    """Apply the options shared by all entries of a hub.
+
+    The daily request budget is a property of the credentials, so the
+    smallest budget configured on any of the hub's entries applies. The
+    dedicated session is used as soon as one of the entries enables it, and
+    closed once it is no longer enabled on any of them.
+    """
+    entries = [
+        entry
+        for entry_id in hub["entries"]
+        if (entry := hass.config_entries.async_get_entry(entry_id))
+    ]
+    client: DowndetectorApiClient = hub["client"]
+
+    budgets = [
+        budget for entry in entries if (budget := entry.options.get(CONF_DAILY_BUDGET, 0))
+    ]
+    client.budget.limit = min(budgets, default=0)
+
+    dedicated = any(entry.options.get(CONF_DEDICATED_SESSION, False) for entry in entries)
+    if dedicated and hub["session"] is None:
+        hub["session"] = create_session(client_context())
+        client.set_session(hub["session"])
+        _LOGGER.debug("Using a dedicated session for client_id %s", client.client_id)
+    elif not dedicated and hub["session"] is not None:
+        client.set_session(async_get_clientsession(hass))
+        session = hub["session"]
+        hub["session"] = None
+
+        async def _async_close_session(_now: Any) -> None:
+            await session.close()
+
+        # Requests still using the old session complete or time out first
+        async_call_later(hass, DEFAULT_TIMEOUT, _async_close_session)
 
 
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Set up Downdetector from a config entry."""
     hass.data.setdefault(DOMAIN, {})
 
-    session = async_get_clientsession(hass)
-    client = DowndetectorApiClient(
-        session, 
-        entry.data[CONF_CLIENT_ID], 
-        entry.data[CONF_CLIENT_SECRET]
+    hub_key, hub = await _async_acquire_hub(hass, entry)
+    coordinator: DowndetectorDataUpdateCoordinator = hub["coordinator"]
+
+    history = ReportHistory(hass, entry.data[CONF_SERVICE_ID])
+    await history.async_load()
+
+    coordinator.async_add_service(
+        entry.data[CONF_SERVICE_ID],
+        entry.data[CONF_SERVICE_NAME],
+        entry.options,
+        history,
     )
 
     hass.data[DOMAIN][entry.entry_id] = {
-        "client": client,
+        "client": hub["client"],
+        "coordinator": coordinator,
+        "hub": hub,
+        "hub_key": hub_key,
+        "history": history,
     }
 
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
 
+    entry.async_on_unload(entry.add_update_listener(_async_update_listener))
+
     return True
 
 
+async def _async_update_listener(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Apply changed options to the running coordinator."""
+    data = hass.data[DOMAIN][entry.entry_id]
+    _async_apply_hub_options(hass, data["hub"])
+    coordinator: DowndetectorDataUpdateCoordinator = data["coordinator"]
+    coordinator.async_set_service_options(entry.data[CONF_SERVICE_ID], entry.options)
+
+
 async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Unload a config entry."""
     if unload_ok := await hass.config_entries.async_unload_platforms(entry, PLATFORMS):
-        hass.data[DOMAIN].pop(entry.entry_id)
+        data = hass.data[DOMAIN].pop(entry.entry_id)
+        data["coordinator"].async_remove_service(entry.data[CONF_SERVICE_ID])
+        # Write the history now; a pending save could otherwise overwrite
+        # the history loaded on reload, or recreate it after removal
+        await data["history"].async_save()
+        _async_release_hub(hass, data["hub_key"], entry.entry_id)
 
     return unload_ok
+
+
+async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Delete the stored report history and statistics of a removed entry."""
+    await ReportHistory(hass, entry.data[CONF_SERVICE_ID]).async_remove()
+    async_clear_report_statistics(hass, entry.data[CONF_SERVICE_ID])
@@ -1,12 +1,28 @@
 """Downdetector API Client."""
 import asyncio
 import base64
+from collections import Counter, OrderedDict
+import codecs
+from dataclasses import dataclass
+from datetime import date, datetime, timezone
+from email.utils import parsedate_to_datetime
+from importlib.util import find_spec
+import json
 import logging
+import math
+import random
+import re
 import time
-from typing import Any, Optional
+from typing import Any, AsyncIterator, Awaitable, Callable, Iterable, Optional
 
 import aiohttp
 import async_timeout
+from yarl import URL
+
+if find_spec("orjson") is not None:
+    from orjson import loads as json_loads
+else:
+    from json import loads as json_loads
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -15,6 +31,561 @@ _LOGGER = logging.getLogger(__name__)
 API_BASE_URL = "https://downdetectorapi.com/v2"
 DEFAULT_TIMEOUT = 10
 TOKEN_CACHE_SECONDS = 3300  # 55 minutes (tokens expire after 1 hour)
+TOKEN_EXPIRY_MARGIN = 60  # Seconds a token is considered expired before expires_in
+TOKEN_REFRESH_AHEAD = 300  # Seconds before expiry the background refresh starts
+COMPANY_FIELDS = "id,name,slug,stats_24,baseline,baseline_current,status"
+OPTIONAL_FIELDS = ("slug", "stats_24", "baseline")  # Fields the status does not depend on
+# Company keys kept from responses; anything else the API adds is dropped
+COMPANY_KEYS = frozenset(COMPANY_FIELDS.split(",")) | {"url"}
+SEARCH_KEYS = ("id", "name", "slug")  # Keys kept from search results
+MAX_SEARCH_RESULTS = 100  # Search results decoded, the rest of the list is skipped
+STREAM_CHUNK_SIZE = 16384
+BATCH_SIZE = 50  # Company IDs per multi-id /companies request
+MAX_CONCURRENT_REQUESTS = 8  # Per-company requests in flight during a batch
+COMPANY_CACHE_TTL = 30  # Seconds company details are reused across callers
+CONDITIONAL_CACHE_SIZE = 512  # GET responses kept for ETag/Last-Modified revalidation
+RATE_LIMIT_PER_SECOND = 5  # Sustained request rate per set of credentials
+RATE_LIMIT_BURST = 10  # Requests allowed back to back before throttling
+MAX_RETRY_AFTER = 30  # Longest Retry-After (seconds) waited out before retrying
+CIRCUIT_FAILURE_THRESHOLD = 3  # Consecutive failures that open the circuit
+CIRCUIT_BASE_TIMEOUT = 30  # Seconds the circuit stays open after the first trip
+CIRCUIT_MAX_TIMEOUT = 900  # Ceiling for the exponential open time
+
+CONNECTOR_LIMIT_PER_HOST = 16  # Pooled connections to the API host
+KEEPALIVE_TIMEOUT = 75  # Seconds idle connections are kept for the next poll
+DNS_CACHE_TTL = 600  # Seconds resolved API addresses are cached
+
+# Upper bounds (seconds) of the request latency histogram buckets
+LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+CIRCUIT_CLOSED = "closed"
+CIRCUIT_OPEN = "open"
+CIRCUIT_HALF_OPEN = "half_open"
+
+
+def _accept_encoding() -> str:
+    """Return the content encodings aiohttp can decode here."""
+    if find_spec("brotli") is None:
+        return "gzip, deflate"
+    return "gzip, deflate, br"
+
+
+def create_session(ssl_context: Optional[Any] = None) -> aiohttp.ClientSession:
+    """Create a session tuned for polling the Downdetector API.
+
+    The session has its own connection pool, so its limits and keepalive are
+    not shared with other integrations: connections to the API host are kept
+    alive between poll cycles, DNS lookups are cached and responses are
+    requested compressed. The caller must close the session.
+
+    Args:
+        ssl_context: SSL context for the connector, or None for the default
+    """
+    connector = aiohttp.TCPConnector(
+        limit_per_host=CONNECTOR_LIMIT_PER_HOST,
+        keepalive_timeout=KEEPALIVE_TIMEOUT,
+        ttl_dns_cache=DNS_CACHE_TTL,
+        ssl=ssl_context if ssl_context is not None else True,
+    )
+    return aiohttp.ClientSession(
+        connector=connector,
+        headers={"Accept-Encoding": _accept_encoding()},
+    )
+
+
+def company_fields(optional: Optional[Iterable[str]] = None) -> str:
+    """Return the fields parameter for company details.
+
+    Args:
+        optional: The optional fields to request, None for all of them
+
+    Returns:
+        COMPANY_FIELDS without the optional fields that were not selected
+    """
+    if optional is None:
+        return COMPANY_FIELDS
+    optional = set(optional)
+    return ",".join(
+        field
+        for field in COMPANY_FIELDS.split(",")
+        if field not in OPTIONAL_FIELDS or field in optional
+    )
+
+
+def project_company(company: Any) -> Any:
+    """Return a company payload with only the keys the integration uses."""
+    if not isinstance(company, dict):
+        return company
+    return {key: value for key, value in company.items() if key in COMPANY_KEYS}
+
+
+_JSON_WHITESPACE = " \t\r\n"
+_JSON_ITEM_END = _JSON_WHITESPACE + ",]"
+_EXPECT_ARRAY = 0
+_EXPECT_FIRST_ITEM = 1
+_EXPECT_ITEM = 2
+_EXPECT_SEPARATOR = 3
+
+
+async def iter_json_array(
+    chunks: AsyncIterator[bytes], decoder: json.JSONDecoder
+) -> AsyncIterator[Any]:
+    """Yield the items of a JSON array as its chunks arrive.
+
+    Each item is decoded as soon as it is complete, so the whole array is
+    never held as text and as objects at the same time. An item is only
+    taken once it is followed by whitespace, a comma or the closing bracket,
+    so a number split across chunks is not decoded early.
+
+    Raises:
+        ValueError: If the body is not a JSON array, has a missing or
+            misplaced separator, or ends before the closing bracket
+    """
+    utf8 = codecs.getincrementaldecoder("utf-8")()
+    buffer = ""
+    # The next token: the opening bracket, an item (or the closing bracket
+    # of an empty array), or the separator after an item
+    expect = _EXPECT_ARRAY
+    final = False
+    chunk_iter = chunks.__aiter__()
+
+    while not final:
+        try:
+            buffer += utf8.decode(await chunk_iter.__anext__())
+        except StopAsyncIteration:
+            buffer += utf8.decode(b"", final=True)
+            final = True
+
+        pos = 0
+        while True:
+            while pos < len(buffer) and buffer[pos] in _JSON_WHITESPACE:
+                pos += 1
+            if pos == len(buffer):
+                break
+            char = buffer[pos]
+            if expect == _EXPECT_ARRAY:
+                if char != "[":
+                    raise ValueError("Expected a JSON array")
+                expect = _EXPECT_FIRST_ITEM
+                pos += 1
+                continue
+            if expect == _EXPECT_SEPARATOR:
+                if char == "]":
+                    return
+                if char != ",":
+                    raise ValueError(f"Expected ',' or ']' in JSON array, got {char!r}")
+                expect = _EXPECT_ITEM
+                pos += 1
+                continue
+            if char == "]" and expect == _EXPECT_FIRST_ITEM:
+                return
+            try:
+                item, end = decoder.raw_decode(buffer, pos)
+            except json.JSONDecodeError:
+                if final:
+                    raise
+                break
+            if end == len(buffer) or buffer[end] not in _JSON_ITEM_END:
+                # Incomplete until more data arrives, invalid at the end
+                if final:
+                    raise ValueError("Invalid or truncated JSON array item")
+                break
+            yield item
+            expect = _EXPECT_SEPARATOR
+            pos = end
+        buffer = buffer[pos:]
+
+    if expect == _EXPECT_ARRAY:
+        raise ValueError("Expected a JSON array")
+    raise ValueError("JSON array ended before its closing bracket")
+
+
+def backoff_delay(base: float, attempt: int, maximum: float) -> float:
+    """Return a jittered exponential backoff delay in seconds.
+
+    The delay doubles with every attempt up to maximum, and is then drawn
+    between half and the full value so that clients do not retry in step.
+    """
+    delay = min(base * 2 ** max(attempt - 1, 0), maximum)
+    return random.uniform(delay / 2, delay)
+
+
+class CircuitOpenError(aiohttp.ClientError):
+    """Raised when a request is refused because the API host is failing."""
+
+
+class RateLimitedError(aiohttp.ClientError):
+    """Raised when a request is refused during a long Retry-After pause."""
+
+
+def _parse_retry_after(value: Optional[str]) -> float:
+    """Return the delay in seconds requested by a Retry-After header."""
+    if not value:
+        return 0
+    try:
+        return max(float(value), 0)
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return 0
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    return max((retry_at - datetime.now(timezone.utc)).total_seconds(), 0)
+
+
+class RateLimiter:
+    """Token bucket limiting the request rate of one API client.
+
+    Requests wait for a token before being sent. A Retry-After received from
+    the API pauses the whole bucket until the requested time. Pauses of up to
+    MAX_RETRY_AFTER are waited out; during longer ones requests fail at once
+    with RateLimitedError.
+    """
+
+    def __init__(self, rate: float = RATE_LIMIT_PER_SECOND, burst: int = RATE_LIMIT_BURST) -> None:
+        """Initialize the rate limiter."""
+        self._rate = rate
+        self._burst = burst
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+        self._lock = asyncio.Lock()
+
+    @property
+    def pause_remaining(self) -> float:
+        """Return the seconds left of a Retry-After pause."""
+        return max(self._paused_until - time.monotonic(), 0)
+
+    def pause(self, seconds: float) -> None:
+        """Hold all requests for the given number of seconds."""
+        self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+
+    async def acquire(self) -> None:
+        """Wait until a request may be sent."""
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                if now < self._paused_until:
+                    if (remaining := self._paused_until - now) > MAX_RETRY_AFTER:
+                        raise RateLimitedError(
+                            f"Rate limited by the API, retrying in {remaining:.0f} seconds"
+                        )
+                    await asyncio.sleep(remaining)
+                    continue
+
+                self._tokens = min(
+                    self._burst, self._tokens + (now - self._updated) * self._rate
+                )
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+
+                await asyncio.sleep((1 - self._tokens) / self._rate)
+
+
+class CircuitBreaker:
+    """Circuit breaker for one API host.
+
+    After CIRCUIT_FAILURE_THRESHOLD consecutive connection errors, timeouts or
+    5xx responses the circuit opens and requests fail immediately. Once the
+    jittered, exponentially growing open time has passed, a single probe
+    request is let through (half-open); its success closes the circuit, its
+    failure opens it again for longer.
+    """
+
+    def __init__(self, host: str) -> None:
+        """Initialize the circuit breaker."""
+        self.host = host
+        self.state = CIRCUIT_CLOSED
+        self._failures = 0
+        self._trips = 0
+        self._open_until = 0.0
+        self._probe_in_flight = False
+
+    @property
+    def retry_in(self) -> float:
+        """Return the seconds until a request may be attempted again."""
+        if self.state == CIRCUIT_CLOSED:
+            return 0
+        return max(self._open_until - time.monotonic(), 0)
+
+    def before_request(self) -> None:
+        """Raise CircuitOpenError if a request may not be sent now."""
+        if self.state == CIRCUIT_CLOSED:
+            return
+        if self.state == CIRCUIT_OPEN and time.monotonic() >= self._open_until:
+            self.state = CIRCUIT_HALF_OPEN
+        if self.state == CIRCUIT_HALF_OPEN and not self._probe_in_flight:
+            self._probe_in_flight = True
+            _LOGGER.debug("Probing %s after circuit was open", self.host)
+            return
+        raise CircuitOpenError(
+            f"Circuit open for {self.host}, retrying in {self.retry_in:.0f} seconds"
+        )
+
+    def record_success(self) -> None:
+        """Record a successful request."""
+        if self.state != CIRCUIT_CLOSED:
+            _LOGGER.info("Connection to %s restored", self.host)
+        self.state = CIRCUIT_CLOSED
+        self._failures = 0
+        self._trips = 0
+        self._probe_in_flight = False
+
+    def record_failure(self) -> None:
+        """Record a failed request, opening the circuit if needed."""
+        self._failures += 1
+        self._probe_in_flight = False
+        if self.state == CIRCUIT_HALF_OPEN or self._failures >= CIRCUIT_FAILURE_THRESHOLD:
+            self._trips += 1
+            timeout = backoff_delay(CIRCUIT_BASE_TIMEOUT, self._trips, CIRCUIT_MAX_TIMEOUT)
+            self._open_until = time.monotonic() + timeout
+            if self.state != CIRCUIT_OPEN:
+                _LOGGER.warning(
+                    "Too many failed requests to %s, pausing for %.0f seconds",
+                    self.host,
+                    timeout,
+                )
+            self.state = CIRCUIT_OPEN
+
+    def release(self) -> None:
+        """Forget a request that ended without a result (e.g. cancelled)."""
+        self._probe_in_flight = False
+
+
+class RequestBudget:
+    """Daily request budget of one API client.
+
+    The budget resets at midnight UTC. A limit of 0 means unlimited.
+    """
+
+    def __init__(self, limit: int = 0) -> None:
+        """Initialize the request budget."""
+        self.limit = limit
+        self._used = 0
+        self._day = datetime.now(timezone.utc).date()
+        # Called with (day, used) whenever a request is recorded
+        self.listener: Optional[Callable[[date, int], None]] = None
+
+    def restore(self, day: date, used: int) -> None:
+        """Restore a persisted count, e.g. across restarts, if it is from today."""
+        self._roll_over()
+        if day == self._day:
+            self._used = max(self._used, used)
+
+    def _roll_over(self) -> None:
+        """Reset the count when a new day has started."""
+        today = datetime.now(timezone.utc).date()
+        if today != self._day:
+            self._day = today
+            self._used = 0
+
+    @property
+    def used(self) -> int:
+        """Return the requests made today."""
+        self._roll_over()
+        return self._used
+
+    @property
+    def remaining(self) -> Optional[int]:
+        """Return the requests left today, or None when unlimited."""
+        self._roll_over()
+        if not self.limit:
+            return None
+        return max(self.limit - self._used, 0)
+
+    def consume(self) -> None:
+        """Record one request."""
+        self._roll_over()
+        self._used += 1
+        if self.listener:
+            self.listener(self._day, self._used)
+
+
+def _as_number(value: Any) -> Optional[float]:
+    """Return value if it is a number (not a bool), else None."""
+    if isinstance(value, bool) or not isinstance(value, (int, float)):
+        return None
+    return value
+
+
+@dataclass(slots=True)
+class CompanyStatus:
+    """Status of one company, built once from its API payloads.
+
+    Consumers read the typed fields instead of walking the payload. The
+    company payload itself is only kept in raw while debug logging is
+    enabled for the integration, so that it shows up in diagnostics.
+    stats_24 is kept until the coordinator has seeded the history with it,
+    and detection is filled in by the coordinator.
+    """
+
+    company_id: str
+    name: Optional[str]
+    slug: Optional[str]
+    url: Optional[str]
+    status: str
+    current_reports: Optional[float]
+    baseline: float
+    reports_stale: bool
+    stats_24: Any
+    detection: Any
+    raw: Optional[dict[str, Any]]
+
+    @classmethod
+    def from_payload(
+        cls,
+        company_id: str,
+        company: dict[str, Any],
+        last_15: Any,
+        reports_stale: bool,
+        keep_raw: bool = False,
+    ) -> "CompanyStatus":
+        """Build a status from the company details and last_15 payloads."""
+        return cls(
+            company_id=company_id,
+            name=company.get("name"),
+            slug=company.get("slug"),
+            url=company.get("url"),
+            status=company.get("status", "unknown"),
+            current_reports=_as_number(last_15),
+            baseline=_as_number(company.get("baseline_current")) or 0,
+            reports_stale=reports_stale,
+            stats_24=company.get("stats_24"),
+            detection=None,
+            raw=company if keep_raw else None,
+        )
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the status as a dict, e.g. for diagnostics."""
+        # __slots__ is generated from the fields by the dataclass decorator
+        return {name: getattr(self, name) for name in self.__slots__}
+
+
+def _endpoint_name(url: str) -> str:
+    """Return the endpoint of a URL with company IDs replaced by {id}."""
+    path = URL(url).path.removeprefix(URL(API_BASE_URL).path.rstrip("/"))
+    if path.startswith("/companies/search"):
+        return path
+    return re.sub(r"^/companies/[^/]+", "/companies/{id}", path)
+
+
+class EndpointMetrics:
+    """Latency histogram and status counts of one API endpoint."""
+
+    def __init__(self) -> None:
+        """Initialize empty metrics."""
+        self.requests = 0
+        self.latency_total = 0.0
+        self.latency_max = 0.0
+        # One count per LATENCY_BUCKETS bound, plus one for slower requests
+        self.buckets = [0] * (len(LATENCY_BUCKETS) + 1)
+        self.statuses: Counter = Counter()
+
+    def record(self, status: Optional[int], latency: float) -> None:
+        """Record a finished request; status is None if no response came."""
+        self.requests += 1
+        self.latency_total += latency
+        self.latency_max = max(self.latency_max, latency)
+        index = next(
+            (index for index, bound in enumerate(LATENCY_BUCKETS) if latency <= bound),
+            len(LATENCY_BUCKETS),
+        )
+        self.buckets[index] += 1
+        self.statuses[str(status) if status else "error"] += 1
+
+    def percentile(self, percent: float) -> float:
+        """Return an upper bound of a latency percentile, in seconds."""
+        if not self.requests:
+            return 0.0
+        rank = math.ceil(self.requests * percent / 100)
+        seen = 0
+        for bound, count in zip(LATENCY_BUCKETS, self.buckets):
+            seen += count
+            if seen >= rank:
+                return min(bound, self.latency_max)
+        return self.latency_max
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the metrics as a JSON-serializable dict."""
+        return {
+            "requests": self.requests,
+            "latency_mean": round(self.latency_total / self.requests, 4) if self.requests else 0.0,
+            "latency_p50": round(self.percentile(50), 4),
+            "latency_p95": round(self.percentile(95), 4),
+            "latency_max": round(self.latency_max, 4),
+            "latency_histogram": {
+                **{f"le_{bound}": count for bound, count in zip(LATENCY_BUCKETS, self.buckets)},
+                "le_inf": self.buckets[-1],
+            },
+            "statuses": dict(self.statuses),
+        }
+
+
+class ApiMetrics:
+    """Request metrics of one API client.
+
+    Recorded on every request: the latency histogram and status codes per
+    endpoint, the bytes received and the JSON decode time. The retry paths
+    (401 with a fresh token, 429/503 after Retry-After) and token requests,
+    including the time requests waited for one, are counted as well.
+    """
+
+    def __init__(self) -> None:
+        """Initialize empty metrics."""
+        self.endpoints: dict[str, EndpointMetrics] = {}
+        self.bytes_received = 0
+        self.decode_time = 0.0
+        self.unauthorized_retries = 0
+        self.throttled_retries = 0
+        self.token_requests = 0
+        self.token_request_time = 0.0
+        self.token_wait_time = 0.0
+        self.token_wait_max = 0.0
+
+    @property
+    def requests(self) -> int:
+        """Return the requests made over all endpoints."""
+        return sum(endpoint.requests for endpoint in self.endpoints.values())
+
+    def record_request(self, url: str, status: Optional[int], latency: float) -> None:
+        """Record a finished request."""
+        name = _endpoint_name(url)
+        if name not in self.endpoints:
+            self.endpoints[name] = EndpointMetrics()
+        self.endpoints[name].record(status, latency)
+
+    def record_token_wait(self, seconds: float) -> None:
+        """Record the time a request waited for a token."""
+        self.token_wait_time += seconds
+        self.token_wait_max = max(self.token_wait_max, seconds)
+
+    def percentile(self, percent: float) -> float:
+        """Return the worst latency percentile over the endpoints, in seconds."""
+        return max(
+            (endpoint.percentile(percent) for endpoint in self.endpoints.values()),
+            default=0.0,
+        )
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the metrics as a JSON-serializable dict."""
+        return {
+            "requests": self.requests,
+            "bytes_received": self.bytes_received,
+            "json_decode_time": round(self.decode_time, 4),
+            "unauthorized_retries": self.unauthorized_retries,
+            "throttled_retries": self.throttled_retries,
+            "token_requests": self.token_requests,
+            "token_request_time": round(self.token_request_time, 4),
+            "token_wait_time": round(self.token_wait_time, 4),
+            "token_wait_max": round(self.token_wait_max, 4),
+            "endpoints": {
+                name: endpoint.as_dict() for name, endpoint in self.endpoints.items()
+            },
+        }
 
 
 class DowndetectorApiClient:
@@ -33,53 +604,470 @@ class DowndetectorApiClient:
         self._client_secret = client_secret
         self._token: Optional[str] = None
         self._token_expires_at: float = 0
+        self._token_obtained_at: Optional[float] = None
         self._token_lock = asyncio.Lock()
+        self._token_refresh_handle: Optional[asyncio.TimerHandle] = None
+        self._token_refresh_task: Optional[asyncio.Task] = None
+        self._token_refresh_attempts = 0
+        # Only set for long-lived clients, see start_token_refresh
+        self._token_refresh_enabled = False
+        # Called with (token, expires_at) whenever a new token is obtained
+        self.token_listener: Optional[Callable[[str, float], None]] = None
+        self._batch_supported = True
+        self._last_reports: dict[str, Any] = {}
+        self._rate_limiter = RateLimiter()
+        self._breakers: dict[str, CircuitBreaker] = {}
+        self._in_flight: dict[tuple, asyncio.Future] = {}
+        self._response_cache: dict[tuple, tuple[float, Any]] = {}
+        # (url, params) -> (ETag, Last-Modified, decoded body)
+        self._conditional_cache: OrderedDict[tuple, tuple[Optional[str], Optional[str], Any]] = OrderedDict()
+        self.conditional_hits = 0
+        self.conditional_misses = 0
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self.shared_requests = 0
+        self.budget = RequestBudget()
+        self.metrics = ApiMetrics()
+
+    def set_session(self, session: aiohttp.ClientSession) -> None:
+        """Send subsequent requests through another session."""
+        self._session = session
+
+    def set_rate_limit(self, rate: float, burst: int) -> None:
+        """Replace the rate limiter, e.g. to benchmark without one."""
+        self._rate_limiter = RateLimiter(rate, burst)
+
+    def clear_response_cache(self) -> None:
+        """Forget the cached responses, so the next requests are sent."""
+        self._response_cache.clear()
+
+    @property
+    def client_id(self) -> str:
+        """Return the API client ID."""
+        return self._client_id
+
+    def diagnostics(self) -> dict[str, Any]:
+        """Return the client's token, cache and connection state."""
+        now = time.time()
+        return {
+            "token_valid": bool(self._token) and now < self._token_expires_at,
+            "token_age": round(now - self._token_obtained_at) if self._token_obtained_at else None,
+            "token_expires_in": round(max(self._token_expires_at - now, 0)) if self._token else None,
+            "in_flight_requests": len(self._in_flight),
+            "shared_requests": self.shared_requests,
+            "response_cache": {
+                "entries": len(self._response_cache),
+                "hits": self.cache_hits,
+                "misses": self.cache_misses,
+            },
+            "conditional_cache": {
+                "entries": len(self._conditional_cache),
+                "hits": self.conditional_hits,
+                "misses": self.conditional_misses,
+            },
+            "batch_supported": self._batch_supported,
+            "rate_limit_pause": round(self._rate_limiter.pause_remaining, 1),
+            "circuit_breakers": {
+                host: {"state": breaker.state, "retry_in": round(breaker.retry_in, 1)}
+                for host, breaker in self._breakers.items()
+            },
+            "budget": {"limit": self.budget.limit, "used": self.budget.used},
+        }
+
+    def estimate_requests(self, company_count: int) -> int:
+        """Return the requests needed to fetch the status of some companies."""
+        if self._batch_supported:
+            return company_count + math.ceil(company_count / BATCH_SIZE)
+        return 2 * company_count
+
+    @property
+    def retry_in(self) -> float:
+        """Return the seconds until the API may be contacted again.
+
+        This covers open circuit breakers, and Retry-After pauses longer
+        than MAX_RETRY_AFTER. Shorter pauses are waited out by the requests.
+        """
+        pause = self._rate_limiter.pause_remaining
+        return max(
+            [
+                pause if pause > MAX_RETRY_AFTER else 0,
+                *(breaker.retry_in for breaker in self._breakers.values()),
+            ]
+        )
+
+    def _breaker_for(self, url: str) -> CircuitBreaker:
+        """Return the circuit breaker of the host a URL points to."""
+        host = URL(url).host or ""
+        if host not in self._breakers:
+            self._breakers[host] = CircuitBreaker(host)
+        return self._breakers[host]
 
     async def _get_auth_token(self) -> str:
-        """Get a valid authentication token, refreshing if necessary."""
-        async with self._token_lock:
-            # Check if we have a valid token
-            if self._token and time.time() < self._token_expires_at:
-                return self._token
+        """Get a valid authentication token, fetching one if necessary.
+
+        A valid token is returned without taking the token lock, so requests
+        never wait behind the background refresh that renews it ahead of
+        expiry.
+        """
+        if self._token and time.time() < self._token_expires_at:
+            return self._token
+
+        start = time.monotonic()
+        try:
+            async with self._token_lock:
+                # Another caller may have fetched a token while we waited
+                if self._token and time.time() < self._token_expires_at:
+                    return self._token
+
+                return await self._fetch_token()
+        finally:
+            self.metrics.record_token_wait(time.monotonic() - start)
+
+    async def _fetch_token(self) -> str:
+        """Request a new token and schedule its background refresh, if enabled.
 
-            # Generate new token
+        Must be called with the token lock held.
+        """
+        try:
+            # Create basic auth header
+            credentials = f"{self._client_id}:{self._client_secret}"
+            encoded_credentials = base64.b64encode(credentials.encode()).decode()
+
+            headers = {
+                "Authorization": f"Basic {encoded_credentials}",
+                "Content-Type": "application/x-www-form-urlencoded"
+            }
+
+            data = "grant_type=client_credentials"
+
+            self.metrics.token_requests += 1
+            start = time.monotonic()
             try:
-                # Create basic auth header
-                credentials = f"{self._client_id}:{self._client_secret}"
-                encoded_credentials = base64.b64encode(credentials.encode()).decode()
-                
-                headers = {
-                    "Authorization": f"Basic {encoded_credentials}",
-                    "Content-Type": "application/x-www-form-urlencoded"
-                }
-                
-                data = "grant_type=client_credentials"
-                
-                async with async_timeout.timeout(DEFAULT_TIMEOUT):
-                    async with self._session.post(
-                        f"{API_BASE_URL}/tokens",
-                        headers=headers,
-                        data=data
-                    ) as response:
+                token_data = await self._request(
+                    "POST",
+                    f"{API_BASE_URL}/tokens",
+                    headers=headers,
+                    data=data
+                )
+            finally:
+                self.metrics.token_request_time += time.monotonic() - start
+
+            self._token = token_data["access_token"]
+            self._token_obtained_at = time.time()
+            expires_in = token_data.get("expires_in")
+            if isinstance(expires_in, (int, float)) and expires_in > TOKEN_EXPIRY_MARGIN:
+                # Set expiry time a bit earlier to be safe
+                lifetime = expires_in - TOKEN_EXPIRY_MARGIN
+            else:
+                lifetime = TOKEN_CACHE_SECONDS
+            self._token_expires_at = time.time() + lifetime
+            self._token_refresh_attempts = 0
+            self._schedule_token_refresh(lifetime - TOKEN_REFRESH_AHEAD)
+            if self.token_listener:
+                self.token_listener(self._token, self._token_expires_at)
+
+            _LOGGER.debug("Successfully obtained new API token")
+            return self._token
+
+        except aiohttp.ClientError as err:
+            _LOGGER.error("Error obtaining API token: %s", err)
+            raise
+        except Exception as err:
+            _LOGGER.error("Unexpected error obtaining API token: %s", err)
+            raise
+
+    def restore_token(self, token: str, expires_at: float) -> bool:
+        """Reuse a previously obtained token, e.g. one persisted across restarts.
+
+        Args:
+            token: The access token
+            expires_at: Unix time after which the token must not be used
+
+        Returns:
+            True if the token was still valid and is now in use
+        """
+        valid_for = expires_at - time.time()
+        if valid_for <= 0:
+            return False
+
+        self._token = token
+        self._token_expires_at = expires_at
+        # Not persisted, so the age of a restored token is unknown
+        self._token_obtained_at = None
+        self._schedule_token_refresh(valid_for - TOKEN_REFRESH_AHEAD)
+        _LOGGER.debug("Restored API token valid for %.0f seconds", valid_for)
+        return True
+
+    def start_token_refresh(self) -> None:
+        """Renew the token in the background ahead of its expiry.
+
+        Only meant for long-lived clients, as the refresh keeps renewing the
+        token until close() is called. Other clients fetch a token when a
+        request needs one.
+        """
+        self._token_refresh_enabled = True
+        if self._token and (valid_for := self._token_expires_at - time.time()) > 0:
+            self._schedule_token_refresh(valid_for - TOKEN_REFRESH_AHEAD)
+
+    def _schedule_token_refresh(self, delay: float) -> None:
+        """Schedule the background token refresh in delay seconds, if enabled."""
+        if not self._token_refresh_enabled:
+            return
+        if self._token_refresh_handle:
+            self._token_refresh_handle.cancel()
+        self._token_refresh_handle = asyncio.get_running_loop().call_later(
+            max(delay, 0), self._start_token_refresh
+        )
+
+    def _start_token_refresh(self) -> None:
+        """Start the background token refresh."""
+        self._token_refresh_handle = None
+        self._token_refresh_task = asyncio.ensure_future(self._async_refresh_token())
+
+    async def _async_refresh_token(self) -> None:
+        """Renew the token while the current one is still valid.
+
+        Requests keep using the current token meanwhile. A failed refresh is
+        retried with backoff until the token expires, after which the next
+        request fetches a token itself.
+        """
+        async with self._token_lock:
+            try:
+                await self._fetch_token()
+            except Exception:  # Logged by _fetch_token
+                self._token_refresh_attempts += 1
+                valid_for = self._token_expires_at - time.time()
+                if valid_for > 0:
+                    self._schedule_token_refresh(
+                        min(
+                            backoff_delay(30, self._token_refresh_attempts, TOKEN_REFRESH_AHEAD),
+                            valid_for,
+                        )
+                    )
+
+    def close(self) -> None:
+        """Stop the background token refresh."""
+        self._token_refresh_enabled = False
+        if self._token_refresh_handle:
+            self._token_refresh_handle.cancel()
+            self._token_refresh_handle = None
+        if self._token_refresh_task and not self._token_refresh_task.done():
+            self._token_refresh_task.cancel()
+        self._token_refresh_task = None
+
+    async def _request(self, method: str, url: str, **kwargs) -> Any:
+        """Send a rate-limited request and return the decoded JSON body.
+
+        GET responses carrying an ETag or Last-Modified header are remembered,
+        and later requests for the same URL and params are made conditional;
+        on 304 Not Modified the remembered body is returned without parsing.
+
+        Raises CircuitOpenError without sending anything while the host's
+        circuit breaker is open, and RateLimitedError while a Retry-After
+        pause longer than MAX_RETRY_AFTER is in effect.
+        """
+        breaker = self._breaker_for(url)
+        breaker.before_request()
+        decode: Callable[[aiohttp.ClientResponse], Awaitable[Any]] = (
+            kwargs.pop("decode", None) or self._read_json
+        )
+
+        cache_key: Optional[tuple] = None
+        cached = None
+        if method == "GET":
+            cache_key = (url, tuple(sorted((kwargs.get("params") or {}).items())))
+            if (cached := self._conditional_cache.get(cache_key)) is not None:
+                etag, last_modified, _ = cached
+                headers = dict(kwargs.get("headers") or {})
+                if etag:
+                    headers["If-None-Match"] = etag
+                if last_modified:
+                    headers["If-Modified-Since"] = last_modified
+                kwargs["headers"] = headers
+
+        status: Optional[int] = None
+        start: Optional[float] = None
+        try:
+            await self._rate_limiter.acquire()
+            self.budget.consume()
+
+            start = time.monotonic()
+            async with async_timeout.timeout(DEFAULT_TIMEOUT):
+                async with self._session.request(method, url, **kwargs) as response:
+                    status = response.status
+                    if response.status in (429, 503):
+                        retry_after = _parse_retry_after(response.headers.get("Retry-After"))
+                        if retry_after:
+                            _LOGGER.warning(
+                                "API returned %s, pausing requests for %.0f seconds",
+                                response.status,
+                                retry_after,
+                            )
+                            self._rate_limiter.pause(retry_after)
+                    if response.status == 304 and cached is not None:
+                        self.conditional_hits += 1
+                        self._conditional_cache.move_to_end(cache_key)
+                        data = cached[2]
+                    else:
                         response.raise_for_status()
-                        token_data = await response.json()
-                        
-                        self._token = token_data["access_token"]
-                        # Set expiry time a bit earlier to be safe
-                        self._token_expires_at = time.time() + TOKEN_CACHE_SECONDS
-                        
-                        _LOGGER.debug("Successfully obtained new API token")
-                        return self._token
-                        
-            except aiohttp.ClientError as err:
-                _LOGGER.error("Error obtaining API token: %s", err)
-                raise
-            except Exception as err:
-                _LOGGER.error("Unexpected error obtaining API token: %s", err)
-                raise
+                        data = await decode(response)
+                        if cache_key is not None:
+                            self._remember_validators(cache_key, response, data)
+                            if cached is not None:
+                                self.conditional_misses += 1
+        except aiohttp.ClientResponseError as err:
+            if err.status >= 500:
+                breaker.record_failure()
+            else:
+                # The host answered, so it is up even if the request was refused
+                breaker.record_success()
+            raise
+        except (aiohttp.ClientConnectionError, asyncio.TimeoutError):
+            breaker.record_failure()
+            raise
+        except BaseException:
+            breaker.release()
+            raise
+        finally:
+            if start is not None:
+                self.metrics.record_request(url, status, time.monotonic() - start)
+
+        breaker.record_success()
+        return data
+
+    async def _read_json(self, response: aiohttp.ClientResponse) -> Any:
+        """Read and decode a JSON response body, recording size and decode time.
+
+        Decoded with orjson when it is installed (Home Assistant ships it).
+        """
+        body = await response.read()
+        self.metrics.bytes_received += len(body)
+        start = time.perf_counter()
+        try:
+            return json_loads(body) if body else None
+        finally:
+            self.metrics.decode_time += time.perf_counter() - start
+
+    async def _read_companies(self, response: aiohttp.ClientResponse) -> Any:
+        """Decode one company or a list of companies, keeping COMPANY_KEYS.
 
-    async def _make_authenticated_request(self, method: str, endpoint: str, **kwargs) -> dict[str, Any]:
-        """Make an authenticated request to the API."""
+        The projected records are what the response and conditional caches
+        keep, so unused fields never outlive the decode.
+        """
+        data = await self._read_json(response)
+        if isinstance(data, list):
+            return [project_company(company) for company in data]
+        return project_company(data)
+
+    async def _read_search_results(self, response: aiohttp.ClientResponse) -> list[dict[str, Any]]:
+        """Stream-decode a search result list, keeping SEARCH_KEYS of each item.
+
+        Decoding stops after MAX_SEARCH_RESULTS items; the rest of the body
+        is discarded with the connection.
+        """
+        decoder = json.JSONDecoder()
+        results: list[dict[str, Any]] = []
+        received = 0
+        waited = 0.0
+
+        async def _chunks() -> AsyncIterator[bytes]:
+            nonlocal received, waited
+            chunks = response.content.iter_chunked(STREAM_CHUNK_SIZE).__aiter__()
+            while True:
+                wait_start = time.perf_counter()
+                try:
+                    chunk = await chunks.__anext__()
+                except StopAsyncIteration:
+                    return
+                finally:
+                    waited += time.perf_counter() - wait_start
+                received += len(chunk)
+                yield chunk
+
+        items = iter_json_array(_chunks(), decoder)
+        start = time.perf_counter()
+        try:
+            async for item in items:
+                if isinstance(item, dict):
+                    results.append({key: item.get(key) for key in SEARCH_KEYS})
+                if len(results) >= MAX_SEARCH_RESULTS:
+                    break
+        except ValueError as err:
+            # Like a non-list response before, a malformed one yields what was decoded
+            _LOGGER.warning("Unexpected company search response: %s", err)
+        finally:
+            await items.aclose()
+            # Decoding is interleaved with reading; only the decoding counts
+            self.metrics.decode_time += time.perf_counter() - start - waited
+            self.metrics.bytes_received += received
+
+        return results
+
+    def _remember_validators(
+        self, cache_key: tuple, response: aiohttp.ClientResponse, data: Any
+    ) -> None:
+        """Remember a response's cache validators and body for revalidation."""
+        etag = response.headers.get("ETag")
+        last_modified = response.headers.get("Last-Modified")
+        if not etag and not last_modified:
+            self._conditional_cache.pop(cache_key, None)
+            return
+
+        self._conditional_cache[cache_key] = (etag, last_modified, data)
+        self._conditional_cache.move_to_end(cache_key)
+        while len(self._conditional_cache) > CONDITIONAL_CACHE_SIZE:
+            self._conditional_cache.popitem(last=False)
+
+    async def _make_authenticated_request(
+        self, method: str, endpoint: str, cache_ttl: float = 0, **kwargs
+    ) -> dict[str, Any]:
+        """Make an authenticated request to the API.
+
+        Concurrent identical GET requests (same endpoint and params) share a
+        single in-flight request. With cache_ttl, the response is also reused
+        for that many seconds.
+        """
+        if method != "GET":
+            return await self._send_authenticated_request(method, endpoint, **kwargs)
+
+        params = kwargs.get("params") or {}
+        key = (method, endpoint, tuple(sorted(params.items())))
+        now = time.monotonic()
+
+        if cache_ttl:
+            if (cached := self._response_cache.get(key)) and cached[0] > now:
+                self.cache_hits += 1
+                return cached[1]
+            self.cache_misses += 1
+
+        if (future := self._in_flight.get(key)) is not None:
+            self.shared_requests += 1
+        else:
+            future = asyncio.ensure_future(
+                self._send_authenticated_request(method, endpoint, **kwargs)
+            )
+            self._in_flight[key] = future
+            future.add_done_callback(lambda _: self._in_flight.pop(key, None))
+            # Mark the exception retrieved even if every caller was cancelled
+            future.add_done_callback(
+                lambda fut: fut.cancelled() or fut.exception()
+            )
+
+        # Shielded so a cancelled caller does not cancel the others
+        data = await asyncio.shield(future)
+
+        if cache_ttl:
+            self._response_cache = {
+                cache_key: entry
+                for cache_key, entry in self._response_cache.items()
+                if entry[0] > now
+            }
+            self._response_cache[key] = (now + cache_ttl, data)
+
+        return data
+
+    async def _send_authenticated_request(self, method: str, endpoint: str, **kwargs) -> dict[str, Any]:
+        """Send an authenticated request, refreshing the token on 401."""
         token = await self._get_auth_token()
         
         headers = kwargs.get("headers", {})
@@ -89,25 +1077,26 @@ class DowndetectorApiClient:
         url = f"{API_BASE_URL}{endpoint}"
         
         try:
-            async with async_timeout.timeout(DEFAULT_TIMEOUT):
-                async with self._session.request(method, url, **kwargs) as response:
-                    response.raise_for_status()
-                    return await response.json()
+            return await self._request(method, url, **kwargs)
         except aiohttp.ClientResponseError as err:
             if err.status == 401:
                 # Token might be expired, clear it and retry once
                 _LOGGER.warning("API token expired, refreshing...")
-                self._token = None
-                self._token_expires_at = 0
+                if self._token == token:
+                    # Unless another request already replaced it
+                    self._token = None
+                    self._token_expires_at = 0
                 
                 # Retry with new token
+                self.metrics.unauthorized_retries += 1
                 token = await self._get_auth_token()
                 headers["Authorization"] = f"Bearer {token}"
                 
-                async with async_timeout.timeout(DEFAULT_TIMEOUT):
-                    async with self._session.request(method, url, **kwargs) as response:
-                        response.raise_for_status()
-                        return await response.json()
+                return await self._request(method, url, **kwargs)
+            if err.status in (429, 503) and 0 < self._rate_limiter.pause_remaining <= MAX_RETRY_AFTER:
+                # The rate limiter holds the retry until Retry-After has passed
+                self.metrics.throttled_retries += 1
+                return await self._request(method, url, **kwargs)
             raise
 
     async def search_companies(self, query: str) -> list[dict[str, Any]]:
@@ -122,8 +1111,9 @@ class DowndetectorApiClient:
         try:
             params = {"name": query}
             data = await self._make_authenticated_request(
-                "GET", "/companies/search", 
-                params=params
+                "GET", "/companies/search",
+                params=params,
+                decode=self._read_search_results,
             )
             return data if isinstance(data, list) else []
         except aiohttp.ClientError as err:
@@ -133,37 +1123,41 @@ class DowndetectorApiClient:
             _LOGGER.error("Unexpected error searching companies: %s", err)
             raise
 
-    async def get_company_status(self, company_id: str) -> dict[str, Any]:
+    async def get_company_status(self, company_id: str) -> CompanyStatus:
         """Get the current status of a company.
 
+        The company details and the last_15 counts are requested concurrently.
+        If only the last_15 request fails, the last known report count is
+        returned instead and the result is flagged with reports_stale.
+
         Args:
             company_id: The ID of the company to check
 
         Returns:
-            Company status information including baseline and current reports
+            Company status including baseline and current reports
         """
         try:
-            # Get company details with stats
-            company_data = await self._make_authenticated_request(
-                "GET", 
-                f"/companies/{company_id}",
-                params={"fields": "id,name,slug,stats_24,baseline,baseline_current,status"}
-            )
-            
-            # Get last 15 minutes data
-            last_15_data = await self._make_authenticated_request(
-                "GET", 
-                f"/companies/{company_id}/last_15"
+            company_data, last_15_data = await asyncio.gather(
+                # Company details with stats
+                self._make_authenticated_request(
+                    "GET",
+                    f"/companies/{company_id}",
+                    cache_ttl=COMPANY_CACHE_TTL,
+                    params={"fields": COMPANY_FIELDS},
+                    decode=self._read_companies,
+                ),
+                # Last 15 minutes data
+                self._make_authenticated_request(
+                    "GET",
+                    f"/companies/{company_id}/last_15"
+                ),
+                return_exceptions=True,
             )
-            
-            # Combine the data
-            return {
-                "company": company_data,
-                "current_reports": last_15_data,
-                "baseline": company_data.get("baseline_current", 0),
-                "status": company_data.get("status", "unknown")
-            }
-            
+            if isinstance(company_data, BaseException):
+                raise company_data
+
+            return self._combine_status(company_id, company_data, last_15_data)
+
         except aiohttp.ClientError as err:
             _LOGGER.error("Error fetching company status for %s: %s", company_id, err)
             raise
@@ -171,6 +1165,178 @@ class DowndetectorApiClient:
             _LOGGER.error("Unexpected error fetching company status: %s", err)
             raise
 
+    async def get_companies_status(
+        self, company_ids: list[str], fields: Optional[dict[str, str]] = None
+    ) -> dict[str, CompanyStatus]:
+        """Get the current status of several companies in one pass.
+
+        Company details are fetched with the multi-id /companies endpoint in
+        chunks of BATCH_SIZE per set of requested fields; if the API rejects
+        it, details fall back to one request per company. The last_15 counts
+        are fetched per company, concurrently with the details, with at most
+        MAX_CONCURRENT_REQUESTS requests in flight. As in get_company_status,
+        a failed last_15 request falls back to the last known report count.
+
+        Args:
+            company_ids: The IDs of the companies to check
+            fields: Fields parameter per company ID, COMPANY_FIELDS by default
+
+        Returns:
+            Mapping of company ID to status, as returned by get_company_status.
+            Companies that could not be fetched are left out.
+        """
+        if not company_ids:
+            return {}
+
+        semaphore = asyncio.Semaphore(MAX_CONCURRENT_REQUESTS)
+
+        async def _get_last_15(company_id: str) -> Any:
+            async with semaphore:
+                return await self._make_authenticated_request(
+                    "GET", f"/companies/{company_id}/last_15"
+                )
+
+        companies_result, *results = await asyncio.gather(
+            self._get_companies(company_ids, fields or {}, semaphore),
+            *(_get_last_15(company_id) for company_id in company_ids),
+            return_exceptions=True,
+        )
+        if isinstance(companies_result, BaseException):
+            raise companies_result
+        companies, errors = companies_result
+
+        statuses: dict[str, CompanyStatus] = {}
+        for company_id, last_15_data in zip(company_ids, results):
+            if company_id not in companies:
+                continue
+            try:
+                statuses[company_id] = self._combine_status(
+                    company_id, companies[company_id], last_15_data
+                )
+            except Exception as err:
+                errors.append(err)
+
+        if not statuses and errors:
+            raise errors[0]
+
+        return statuses
+
+    async def _get_companies(
+        self,
+        company_ids: list[str],
+        fields: dict[str, str],
+        semaphore: asyncio.Semaphore,
+    ) -> tuple[dict[str, dict[str, Any]], list[Exception]]:
+        """Fetch company details for several companies.
+
+        Companies are fetched in multi-id batches when the API supports it.
+        Companies a batch response leaves out are fetched individually.
+
+        Returns:
+            Mapping of company ID to company details, and the errors raised
+            for companies that could not be fetched
+        """
+        companies: dict[str, dict[str, Any]] = {}
+        errors: list[Exception] = []
+
+        if self._batch_supported:
+            # Companies requesting the same fields share batches
+            groups: dict[str, list[str]] = {}
+            for company_id in company_ids:
+                groups.setdefault(fields.get(company_id, COMPANY_FIELDS), []).append(company_id)
+            try:
+                for group_fields, group_ids in groups.items():
+                    for start in range(0, len(group_ids), BATCH_SIZE):
+                        chunk = group_ids[start:start + BATCH_SIZE]
+                        data = await self._make_authenticated_request(
+                            "GET",
+                            "/companies",
+                            cache_ttl=COMPANY_CACHE_TTL,
+                            params={"ids": ",".join(chunk), "fields": group_fields},
+                            decode=self._read_companies,
+                        )
+                        for company_data in data if isinstance(data, list) else []:
+                            companies[str(company_data.get("id"))] = company_data
+            except aiohttp.ClientResponseError as err:
+                if err.status not in (400, 404, 405):
+                    raise
+                _LOGGER.debug(
+                    "Multi-id company lookup not supported (%s), using per-company requests",
+                    err.status,
+                )
+                self._batch_supported = False
+                companies.clear()
+            else:
+                companies = {
+                    company_id: companies[company_id]
+                    for company_id in company_ids
+                    if company_id in companies
+                }
+                if len(companies) == len(company_ids):
+                    return companies, errors
+                # The API may ignore ids or paginate; fetch the rest one by one
+                _LOGGER.warning(
+                    "Multi-id company lookup left out %s of %s companies, "
+                    "fetching them individually",
+                    len(company_ids) - len(companies),
+                    len(company_ids),
+                )
+
+        missing = [company_id for company_id in company_ids if company_id not in companies]
+
+        async def _get_company(company_id: str) -> dict[str, Any]:
+            async with semaphore:
+                return await self._make_authenticated_request(
+                    "GET",
+                    f"/companies/{company_id}",
+                    cache_ttl=COMPANY_CACHE_TTL,
+                    params={"fields": fields.get(company_id, COMPANY_FIELDS)},
+                    decode=self._read_companies,
+                )
+
+        results = await asyncio.gather(
+            *(_get_company(company_id) for company_id in missing),
+            return_exceptions=True,
+        )
+        for company_id, company_data in zip(missing, results):
+            if isinstance(company_data, Exception):
+                _LOGGER.warning("Error fetching company %s: %s", company_id, company_data)
+                errors.append(company_data)
+                continue
+            companies[company_id] = company_data
+
+        return companies, errors
+
+    def _combine_status(
+        self, company_id: str, company_data: dict[str, Any], last_15_data: Any
+    ) -> CompanyStatus:
+        """Combine company details and last_15 data into a CompanyStatus.
+
+        If last_15_data is the exception from a failed last_15 request, the
+        last known report count is used and the result is flagged as stale.
+        Without a previous count the exception is raised.
+        """
+        reports_stale = isinstance(last_15_data, BaseException)
+        if reports_stale:
+            if company_id not in self._last_reports:
+                raise last_15_data
+            _LOGGER.warning(
+                "Error fetching last_15 for %s, using last known reports: %s",
+                company_id,
+                last_15_data,
+            )
+            last_15_data = self._last_reports[company_id]
+        else:
+            self._last_reports[company_id] = last_15_data
+
+        return CompanyStatus.from_payload(
+            company_id,
+            company_data,
+            last_15_data,
+            reports_stale,
+            keep_raw=_LOGGER.isEnabledFor(logging.DEBUG),
+        )
+
     async def test_connection(self) -> bool:
         """Test the API connection.
         
@@ -0,0 +1,43 @@
+"""Binary sensor platform for Downdetector integration."""
+from __future__ import annotations
+
+from homeassistant.components.binary_sensor import (
+    BinarySensorDeviceClass,
+    BinarySensorEntity,
+)
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.entity_platform import AddEntitiesCallback
+
+from .const import DOMAIN, STATUS_OPERATIONAL
+from .coordinator import DowndetectorDataUpdateCoordinator
+from .entity import DowndetectorEntity
+
+
+async def async_setup_entry(
+    hass: HomeAssistant,
+    entry: ConfigEntry,
+    async_add_entities: AddEntitiesCallback,
+) -> None:
+    """Set up Downdetector binary sensor based on a config entry."""
+    coordinator: DowndetectorDataUpdateCoordinator = hass.data[DOMAIN][entry.entry_id]["coordinator"]
+
+    async_add_entities([DowndetectorOutageBinarySensor(coordinator, entry)])
+
+
+class DowndetectorOutageBinarySensor(DowndetectorEntity, BinarySensorEntity):
+    """Binary sensor that is on while a service has a minor or major outage."""
+
+    _attr_name = "Outage"
+    _attr_device_class = BinarySensorDeviceClass.PROBLEM
+
+    def __init__(
+        self, coordinator: DowndetectorDataUpdateCoordinator, entry: ConfigEntry
+    ) -> None:
+        """Initialize the binary sensor."""
+        super().__init__(coordinator, entry, "outage")
+
+    def _update_from_data(self) -> None:
+        """Compute the state from the coordinator data."""
+        data = self.service_data
+        self._attr_is_on = self._service_status(data) != STATUS_OPERATIONAL if data else None
@@ -7,16 +7,44 @@ from typing import Any
 import voluptuous as vol
 
 from homeassistant import config_entries
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.data_entry_flow import FlowResult
 from homeassistant.helpers.aiohttp_client import async_get_clientsession
 import homeassistant.helpers.config_validation as cv
 
-from .api import DowndetectorApiClient
-from .const import CONF_SERVICE_ID, CONF_SERVICE_NAME, CONF_CLIENT_ID, CONF_CLIENT_SECRET, DOMAIN
+from .api import OPTIONAL_FIELDS, DowndetectorApiClient
+from .const import (
+    CONF_CLIENT_ID,
+    CONF_CLIENT_SECRET,
+    CONF_DAILY_BUDGET,
+    CONF_DEDICATED_SESSION,
+    CONF_FIELDS,
+    CONF_HEARTBEAT_INTERVAL,
+    CONF_MAJOR_THRESHOLD,
+    CONF_MAX_INTERVAL,
+    CONF_MIN_INTERVAL,
+    CONF_MINOR_THRESHOLD,
+    CONF_SERVICE_ID,
+    CONF_SERVICE_NAME,
+    CONF_SERVICES,
+    CONF_UPDATE_INTERVAL,
+    DEFAULT_MAJOR_THRESHOLD,
+    DEFAULT_MAX_INTERVAL,
+    DEFAULT_MIN_INTERVAL,
+    DEFAULT_MINOR_THRESHOLD,
+    DOMAIN,
+    UPDATE_INTERVAL,
+)
+from .search import async_get_company_search
 
 _LOGGER = logging.getLogger(__name__)
 
+FIELD_LABELS = {
+    "slug": "Company slug",
+    "stats_24": "24 hour report history (stats_24)",
+    "baseline": "Long-term baseline",
+}
+
 
 async def validate_service(hass: HomeAssistant, service_id: str, client_id: str, client_secret: str) -> dict[str, Any]:
     """Validate the service ID by fetching its status."""
@@ -29,6 +57,67 @@ async def validate_service(hass: HomeAssistant, service_id: str, client_id: str,
     except Exception as err:
         _LOGGER.error("Error validating service: %s", err)
         raise
+    finally:
+        client.close()
+
+
+def _service_options(
+    search_results: list[dict[str, Any]], configured: set[str | None]
+) -> dict[str, str]:
+    """Return the selectable search results by service ID.
+
+    Services that are already configured are left out.
+    """
+    return {
+        str(service["id"]): service["name"]
+        for service in search_results
+        if service.get("id") is not None
+        and service.get("name")
+        and f"{DOMAIN}_{service['id']}" not in configured
+    }
+
+
+async def _async_validate_services(
+    client: DowndetectorApiClient, service_ids: list[str]
+) -> list[str]:
+    """Return the selected services whose status can be fetched.
+
+    All services are validated with one batched status fetch.
+    """
+    statuses = await client.get_companies_status(service_ids)
+    if missing := [service_id for service_id in service_ids if service_id not in statuses]:
+        _LOGGER.warning("Skipping services that could not be fetched: %s", ", ".join(missing))
+    return [service_id for service_id in service_ids if service_id in statuses]
+
+
+@callback
+def _async_import_services(
+    hass: HomeAssistant,
+    services: dict[str, str],
+    client_id: str,
+    client_secret: str,
+) -> None:
+    """Start a flow creating an entry for each service.
+
+    Args:
+        hass: Home Assistant instance
+        services: Names of the services by service ID
+        client_id: API client ID of the new entries
+        client_secret: API client secret of the new entries
+    """
+    for service_id, service_name in services.items():
+        hass.async_create_task(
+            hass.config_entries.flow.async_init(
+                DOMAIN,
+                context={"source": config_entries.SOURCE_IMPORT},
+                data={
+                    CONF_SERVICE_ID: service_id,
+                    CONF_SERVICE_NAME: service_name,
+                    CONF_CLIENT_ID: client_id,
+                    CONF_CLIENT_SECRET: client_secret,
+                },
+            )
+        )
 
 
 class DowndetectorConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
@@ -42,6 +131,22 @@ class DowndetectorConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
         self._selected_service: dict[str, Any] | None = None
         self._client_id: str = ""
         self._client_secret: str = ""
+        # Client validated in the user step, reused with its token for searches
+        self._client: DowndetectorApiClient | None = None
+
+    @staticmethod
+    @callback
+    def async_get_options_flow(
+        config_entry: config_entries.ConfigEntry,
+    ) -> DowndetectorOptionsFlow:
+        """Get the options flow for this handler."""
+        return DowndetectorOptionsFlow(config_entry)
+
+    @callback
+    def async_remove(self) -> None:
+        """Close the validated client when the flow is done."""
+        if self._client:
+            self._client.close()
 
     async def async_step_user(
         self, user_input: dict[str, Any] | None = None
@@ -62,6 +167,9 @@ class DowndetectorConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
                     if await client.test_connection():
                         self._client_id = client_id
                         self._client_secret = client_secret
+                        if self._client:
+                            self._client.close()
+                        self._client = client
                         return await self.async_step_search()
                     else:
                         errors["base"] = "invalid_auth"
@@ -94,11 +202,10 @@ class DowndetectorConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
 
             if search_query:
                 try:
-                    session = async_get_clientsession(self.hass)
-                    client = DowndetectorApiClient(session, self._client_id, self._client_secret)
-
-                    # Search for companies
-                    companies = await client.search_companies(search_query)
+                    # Search for companies, cached across flows
+                    companies = await async_get_company_search(self.hass).async_search(
+                        self._client, search_query
+                    )
 
                     if companies:
                         self._search_results = companies
@@ -125,54 +232,261 @@ class DowndetectorConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
     async def async_step_select_service(
         self, user_input: dict[str, Any] | None = None
     ) -> FlowResult:
-        """Handle service selection from search results."""
+        """Handle service selection from search results.
+
+        Several services can be selected at once. The first becomes this
+        flow's entry, and an entry is imported for each of the others.
+        """
         errors: dict[str, str] = {}
+        service_options = _service_options(self._search_results, self._async_current_ids())
 
         if user_input is not None:
-            selected_name = user_input["service"]
-
-            # Find the selected service from search results
-            for service in self._search_results:
-                if service.get("name") == selected_name:
-                    self._selected_service = service
-                    break
-
-            if self._selected_service:
-                service_id = str(self._selected_service.get("id"))
-                service_name = self._selected_service.get("name")
-
-                # Check if already configured
-                await self.async_set_unique_id(f"{DOMAIN}_{service_id}")
-                self._abort_if_unique_id_configured()
-
-                return self.async_create_entry(
-                    title=service_name,
-                    data={
-                        CONF_SERVICE_ID: service_id,
-                        CONF_SERVICE_NAME: service_name,
-                        CONF_CLIENT_ID: self._client_id,
-                        CONF_CLIENT_SECRET: self._client_secret,
-                    },
-                )
+            selected = [
+                service_id
+                for service_id in user_input[CONF_SERVICES]
+                if service_id in service_options
+            ]
+
+            try:
+                valid = await _async_validate_services(self._client, selected) if selected else []
+            except Exception:
+                _LOGGER.exception("Unexpected exception during service validation")
+                errors["base"] = "cannot_connect"
             else:
+                if valid:
+                    service_id, *others = valid
+
+                    # Check if already configured
+                    await self.async_set_unique_id(f"{DOMAIN}_{service_id}")
+                    self._abort_if_unique_id_configured()
+
+                    _async_import_services(
+                        self.hass,
+                        {other: service_options[other] for other in others},
+                        self._client_id,
+                        self._client_secret,
+                    )
+                    return self.async_create_entry(
+                        title=service_options[service_id],
+                        data={
+                            CONF_SERVICE_ID: service_id,
+                            CONF_SERVICE_NAME: service_options[service_id],
+                            CONF_CLIENT_ID: self._client_id,
+                            CONF_CLIENT_SECRET: self._client_secret,
+                        },
+                    )
                 errors["base"] = "service_not_found"
 
-        # Create options list for selection
-        service_options = {
-            service.get("name"): service.get("name")
-            for service in self._search_results
-            if service.get("name")
+        if not service_options:
+            # Nothing new to add, go back to search
+            return self.async_show_form(
+                step_id="search",
+                data_schema=vol.Schema({vol.Required("search_query"): cv.string}),
+                errors={"base": "no_new_services"},
+            )
+
+        return self.async_show_form(
+            step_id="select_service",
+            data_schema=vol.Schema(
+                {
+                    vol.Required(CONF_SERVICES): cv.multi_select(service_options),
+                }
+            ),
+            errors=errors,
+            description_placeholders={
+                "num_results": str(len(self._search_results))
+            },
+        )
+
+    async def async_step_import(self, import_data: dict[str, Any]) -> FlowResult:
+        """Create the entry of a service selected together with others."""
+        await self.async_set_unique_id(f"{DOMAIN}_{import_data[CONF_SERVICE_ID]}")
+        self._abort_if_unique_id_configured()
+
+        return self.async_create_entry(
+            title=import_data[CONF_SERVICE_NAME], data=import_data
+        )
+
+
+class DowndetectorOptionsFlow(config_entries.OptionsFlow):
+    """Handle Downdetector options."""
+
+    def __init__(self, config_entry: config_entries.ConfigEntry) -> None:
+        """Initialize the options flow."""
+        self._config_entry = config_entry
+        self._search_results: list[dict[str, Any]] = []
+        # Client created by this flow when the entry is not loaded
+        self._own_client: DowndetectorApiClient | None = None
+
+    async def async_step_init(
+        self, user_input: dict[str, Any] | None = None
+    ) -> FlowResult:
+        """Choose between changing the options and adding services."""
+        return self.async_show_menu(
+            step_id="init", menu_options=["settings", "add_services"]
+        )
+
+    async def async_step_settings(
+        self, user_input: dict[str, Any] | None = None
+    ) -> FlowResult:
+        """Manage the polling, detection, request budget and connection options."""
+        errors: dict[str, str] = {}
+
+        if user_input is not None:
+            if user_input[CONF_MIN_INTERVAL] > user_input[CONF_MAX_INTERVAL]:
+                errors["base"] = "invalid_interval_bounds"
+            elif user_input[CONF_MINOR_THRESHOLD] > user_input[CONF_MAJOR_THRESHOLD]:
+                errors["base"] = "invalid_thresholds"
+            else:
+                return self.async_create_entry(title="", data=user_input)
+
+        options = self._config_entry.options
+        return self.async_show_form(
+            step_id="settings",
+            data_schema=vol.Schema(
+                {
+                    vol.Required(
+                        CONF_UPDATE_INTERVAL,
+                        default=options.get(CONF_UPDATE_INTERVAL, UPDATE_INTERVAL),
+                    ): vol.All(vol.Coerce(int), vol.Range(min=30, max=86400)),
+                    vol.Required(
+                        CONF_MIN_INTERVAL,
+                        default=options.get(CONF_MIN_INTERVAL, DEFAULT_MIN_INTERVAL),
+                    ): vol.All(vol.Coerce(int), vol.Range(min=30, max=3600)),
+                    vol.Required(
+                        CONF_MAX_INTERVAL,
+                        default=options.get(CONF_MAX_INTERVAL, DEFAULT_MAX_INTERVAL),
+                    ): vol.All(vol.Coerce(int), vol.Range(min=60, max=86400)),
+                    vol.Required(
+                        CONF_MINOR_THRESHOLD,
+                        default=options.get(CONF_MINOR_THRESHOLD, DEFAULT_MINOR_THRESHOLD),
+                    ): vol.All(vol.Coerce(float), vol.Range(min=1.0, max=100.0)),
+                    vol.Required(
+                        CONF_MAJOR_THRESHOLD,
+                        default=options.get(CONF_MAJOR_THRESHOLD, DEFAULT_MAJOR_THRESHOLD),
+                    ): vol.All(vol.Coerce(float), vol.Range(min=1.0, max=100.0)),
+                    vol.Required(
+                        CONF_FIELDS,
+                        default=options.get(CONF_FIELDS, list(OPTIONAL_FIELDS)),
+                    ): cv.multi_select(FIELD_LABELS),
+                    vol.Required(
+                        CONF_DAILY_BUDGET,
+                        default=options.get(CONF_DAILY_BUDGET, 0),
+                    ): vol.All(vol.Coerce(int), vol.Range(min=0)),
+                    vol.Required(
+                        CONF_DEDICATED_SESSION,
+                        default=options.get(CONF_DEDICATED_SESSION, False),
+                    ): cv.boolean,
+                    vol.Required(
+                        CONF_HEARTBEAT_INTERVAL,
+                        default=options.get(CONF_HEARTBEAT_INTERVAL, 0),
+                    ): vol.All(vol.Coerce(int), vol.Range(min=0)),
+                }
+            ),
+            errors=errors,
+        )
+
+    def _client(self) -> DowndetectorApiClient:
+        """Return the client of the entry's hub, or the flow's own if not loaded."""
+        if data := self.hass.data.get(DOMAIN, {}).get(self._config_entry.entry_id):
+            return data["client"]
+        if self._own_client is None:
+            self._own_client = DowndetectorApiClient(
+                async_get_clientsession(self.hass),
+                self._config_entry.data[CONF_CLIENT_ID],
+                self._config_entry.data[CONF_CLIENT_SECRET],
+            )
+        return self._own_client
+
+    @callback
+    def async_remove(self) -> None:
+        """Close the flow's own client when the flow is done."""
+        if self._own_client:
+            self._own_client.close()
+
+    async def async_step_add_services(
+        self, user_input: dict[str, Any] | None = None
+    ) -> FlowResult:
+        """Search for services to add with this entry's credentials."""
+        errors: dict[str, str] = {}
+
+        if user_input is not None:
+            search_query = user_input.get("search_query", "").strip()
+
+            if search_query:
+                try:
+                    companies = await async_get_company_search(self.hass).async_search(
+                        self._client(), search_query
+                    )
+                except Exception:
+                    _LOGGER.exception("Unexpected exception during company search")
+                    errors["base"] = "cannot_connect"
+                else:
+                    if companies:
+                        self._search_results = companies
+                        return await self.async_step_select_services()
+                    errors["base"] = "no_services_found"
+            else:
+                errors["base"] = "invalid_search"
+
+        return self.async_show_form(
+            step_id="add_services",
+            data_schema=vol.Schema(
+                {
+                    vol.Required("search_query"): cv.string,
+                }
+            ),
+            errors=errors,
+        )
+
+    async def async_step_select_services(
+        self, user_input: dict[str, Any] | None = None
+    ) -> FlowResult:
+        """Add the selected services, each as its own entry on the same hub."""
+        errors: dict[str, str] = {}
+        configured = {
+            entry.unique_id for entry in self.hass.config_entries.async_entries(DOMAIN)
         }
+        service_options = _service_options(self._search_results, configured)
+
+        if user_input is not None:
+            selected = [
+                service_id
+                for service_id in user_input[CONF_SERVICES]
+                if service_id in service_options
+            ]
+
+            try:
+                valid = await _async_validate_services(self._client(), selected) if selected else []
+            except Exception:
+                _LOGGER.exception("Unexpected exception during service validation")
+                errors["base"] = "cannot_connect"
+            else:
+                if valid:
+                    _async_import_services(
+                        self.hass,
+                        {service_id: service_options[service_id] for service_id in valid},
+                        self._config_entry.data[CONF_CLIENT_ID],
+                        self._config_entry.data[CONF_CLIENT_SECRET],
+                    )
+                    # Leave this entry's options unchanged
+                    return self.async_create_entry(
+                        title="", data=dict(self._config_entry.options)
+                    )
+                errors["base"] = "service_not_found"
 
         if not service_options:
-            # No valid services found, go back to search
-            return await self.async_step_search()
+            return self.async_show_form(
+                step_id="add_services",
+                data_schema=vol.Schema({vol.Required("search_query"): cv.string}),
+                errors={"base": "no_new_services"},
+            )
 
         return self.async_show_form(
-            step_id="select_service",
+            step_id="select_services",
             data_schema=vol.Schema(
                 {
-                    vol.Required("service"): vol.In(service_options),
+                    vol.Required(CONF_SERVICES): cv.multi_select(service_options),
                 }
             ),
             errors=errors,
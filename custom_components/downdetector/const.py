@@ -6,11 +6,47 @@ DEFAULT_NAME = "Downdetector"
 # Update interval in seconds
 UPDATE_INTERVAL = 300  # 5 minutes
 
+# Adaptive polling bounds in seconds
+DEFAULT_MIN_INTERVAL = 60  # While a service is in warning/danger or reports rise
+DEFAULT_MAX_INTERVAL = 1800  # Back-off ceiling while a service is calm
+POLL_SLACK = 30  # Services due within this window join the current poll
+
+# Baseline multiples of minor and major outages
+DEFAULT_MINOR_THRESHOLD = 1.5
+DEFAULT_MAJOR_THRESHOLD = 2.0
+
+# Delay used to gather refresh requests from entries set up together
+REFRESH_COOLDOWN = 2
+
 # Configuration
 CONF_SERVICE_ID = "service_id"
 CONF_SERVICE_NAME = "service_name"
+CONF_SERVICES = "services"
 CONF_CLIENT_ID = "client_id"
 CONF_CLIENT_SECRET = "client_secret"
+CONF_MIN_INTERVAL = "min_update_interval"
+CONF_MAX_INTERVAL = "max_update_interval"
+CONF_DAILY_BUDGET = "daily_request_budget"
+CONF_DEDICATED_SESSION = "dedicated_session"
+CONF_HEARTBEAT_INTERVAL = "heartbeat_interval"
+CONF_UPDATE_INTERVAL = "update_interval"
+CONF_MINOR_THRESHOLD = "minor_threshold"
+CONF_MAJOR_THRESHOLD = "major_threshold"
+CONF_FIELDS = "fields"
+
+# hass.data keys
+DATA_HUBS = "hubs"
+DATA_TOKEN_STORE = "token_store"
+DATA_COMPANY_SEARCH = "company_search"
+
+# Storage
+STORAGE_VERSION = 1
+STORAGE_KEY_TOKENS = f"{DOMAIN}.tokens"
+STORAGE_KEY_COMPANIES = f"{DOMAIN}.companies"
+TOKEN_SAVE_DELAY = 10
+HISTORY_SAVE_DELAY = 600  # Longest a 24 hour history change waits to be saved
+HOURLY_HISTORY_SAVE_DELAY = 3600  # Same for the 90 day hourly history
+CATALOG_SAVE_DELAY = 10
 
 # Attributes
 ATTR_BASELINE = "baseline"
@@ -19,3 +55,12 @@ ATTR_SERVICE_ID = "service_id"
 ATTR_SERVICE_NAME = "service_name"
 ATTR_STATUS = "status"
 ATTR_LAST_UPDATED = "last_updated"
+ATTR_REPORTS_STALE = "reports_stale"
+ATTR_CONFIDENCE = "confidence"
+ATTR_DAILY_BUDGET = "daily_budget"
+ATTR_REQUESTS_TODAY = "requests_today"
+
+# Status values
+STATUS_OPERATIONAL = "operational"
+STATUS_MINOR_OUTAGE = "minor_outage"
+STATUS_MAJOR_OUTAGE = "major_outage"
@@ -0,0 +1,447 @@
+"""Data update coordinator for the Downdetector integration."""
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Mapping
+from dataclasses import asdict, dataclass
+from datetime import datetime, timedelta
+import logging
+import time
+from typing import Any
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.debounce import Debouncer
+from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
+from homeassistant.util import dt as dt_util
+
+from .api import (
+    COMPANY_FIELDS,
+    CompanyStatus,
+    DowndetectorApiClient,
+    backoff_delay,
+    company_fields,
+)
+from .const import (
+    CONF_FIELDS,
+    CONF_MAJOR_THRESHOLD,
+    CONF_MAX_INTERVAL,
+    CONF_MIN_INTERVAL,
+    CONF_MINOR_THRESHOLD,
+    CONF_UPDATE_INTERVAL,
+    DEFAULT_MAJOR_THRESHOLD,
+    DEFAULT_MAX_INTERVAL,
+    DEFAULT_MIN_INTERVAL,
+    DEFAULT_MINOR_THRESHOLD,
+    DOMAIN,
+    POLL_SLACK,
+    REFRESH_COOLDOWN,
+    UPDATE_INTERVAL,
+)
+from .detection import detect_outages
+from .history import HOURLY_RESOLUTION, ReportHistory
+from .statistics import async_get_last_imported, async_import_report_statistics
+
+_LOGGER = logging.getLogger(__name__)
+
+
+@dataclass
+class ServiceSchedule:
+    """Adaptive polling state and options of one service."""
+
+    name: str
+    min_interval: int = DEFAULT_MIN_INTERVAL
+    max_interval: int = DEFAULT_MAX_INTERVAL
+    base_interval: int = UPDATE_INTERVAL
+    interval: int = UPDATE_INTERVAL
+    next_poll: float = 0.0
+    minor_threshold: float = DEFAULT_MINOR_THRESHOLD
+    major_threshold: float = DEFAULT_MAJOR_THRESHOLD
+    fields: str = COMPANY_FIELDS
+
+    def clamp(self, interval: float) -> int:
+        """Return interval limited to the configured bounds."""
+        return int(max(self.min_interval, min(interval, self.max_interval)))
+
+
+class DowndetectorDataUpdateCoordinator(DataUpdateCoordinator[dict[str, CompanyStatus]]):
+    """Class to manage fetching Downdetector data for all services of a hub.
+
+    One coordinator exists per set of API credentials. Config entries register
+    their service ID with it, and every refresh fetches all registered services
+    that are due in a single pass. The coordinator data maps service ID to
+    status.
+
+    Each service has its own adaptive interval: it is tightened to the minimum
+    while the service is in warning/danger or its reports are rising, and
+    backed off towards the maximum while it is calm. The coordinator then
+    schedules its next tick for the earliest service that becomes due.
+    """
+
+    def __init__(self, hass: HomeAssistant, client: DowndetectorApiClient) -> None:
+        """Initialize the coordinator."""
+        self.client = client
+        self._services: dict[str, ServiceSchedule] = {}
+        self.histories: dict[str, ReportHistory] = {}
+        self._failures = 0
+        self.last_refresh_at: datetime | None = None
+        self.last_refresh_duration: float | None = None
+        self.last_refresh_services = 0
+        # Start of the latest hour imported into long-term statistics per service
+        self._statistics_until: dict[str, float] = {}
+        self._statistics_hour = 0
+        self._statistics_task: asyncio.Task | None = None
+
+        super().__init__(
+            hass,
+            _LOGGER,
+            # Shared by the entries of a hub, so it must not bind to the entry
+            # being set up: its unload would shut the coordinator down for all
+            config_entry=None,
+            name=DOMAIN,
+            update_interval=timedelta(seconds=UPDATE_INTERVAL),
+            # Gather refresh requests from entries set up together into one pass
+            request_refresh_debouncer=Debouncer(
+                hass, _LOGGER, cooldown=REFRESH_COOLDOWN, immediate=False
+            ),
+        )
+
+    @property
+    def service_ids(self) -> list[str]:
+        """Return the IDs of the services polled by this coordinator."""
+        return list(self._services)
+
+    def service_interval(self, service_id: str) -> int | None:
+        """Return the current polling interval of a service in seconds."""
+        if (schedule := self._services.get(service_id)) is None:
+            return None
+        return schedule.interval
+
+    @callback
+    def async_add_service(
+        self,
+        service_id: str,
+        service_name: str,
+        options: Mapping[str, Any],
+        history: ReportHistory | None = None,
+    ) -> None:
+        """Register a service to be polled on the next refresh.
+
+        If a history is given, every fetched report count is recorded in it.
+        """
+        schedule = ServiceSchedule(service_name)
+        self._services[service_id] = schedule
+        if history is not None:
+            self.histories[service_id] = history
+        self.async_set_service_options(service_id, options)
+
+    @callback
+    def async_set_service_options(
+        self, service_id: str, options: Mapping[str, Any]
+    ) -> None:
+        """Apply a registered service's config entry options.
+
+        Polling options take effect from the service's next poll. Changed
+        thresholds re-run outage detection on the current data, so the
+        entities reflect them right away.
+        """
+        if (schedule := self._services.get(service_id)) is None:
+            return
+        schedule.min_interval = options.get(CONF_MIN_INTERVAL, DEFAULT_MIN_INTERVAL)
+        schedule.max_interval = max(
+            schedule.min_interval, options.get(CONF_MAX_INTERVAL, DEFAULT_MAX_INTERVAL)
+        )
+        schedule.base_interval = schedule.clamp(
+            options.get(CONF_UPDATE_INTERVAL, UPDATE_INTERVAL)
+        )
+        schedule.interval = schedule.clamp(schedule.interval)
+        schedule.fields = company_fields(options.get(CONF_FIELDS))
+
+        thresholds = (
+            options.get(CONF_MINOR_THRESHOLD, DEFAULT_MINOR_THRESHOLD),
+            options.get(CONF_MAJOR_THRESHOLD, DEFAULT_MAJOR_THRESHOLD),
+        )
+        if thresholds != (schedule.minor_threshold, schedule.major_threshold):
+            schedule.minor_threshold, schedule.major_threshold = thresholds
+            if self.data and service_id in self.data:
+                self._detect_outages(self.data)
+                self.async_update_listeners()
+
+    @callback
+    def async_make_all_due(self) -> None:
+        """Make every service due on the next refresh, as on a full pass."""
+        for schedule in self._services.values():
+            schedule.next_poll = 0
+
+    @callback
+    def async_remove_service(self, service_id: str) -> None:
+        """Stop polling a service."""
+        self._services.pop(service_id, None)
+        self.histories.pop(service_id, None)
+        self._statistics_until.pop(service_id, None)
+        if self.data:
+            self.data.pop(service_id, None)
+
+    async def _async_update_data(self) -> dict[str, CompanyStatus]:
+        """Update data for the registered services that are due, timing the pass."""
+        start = time.monotonic()
+        try:
+            return await self._async_poll_due(start)
+        finally:
+            self.last_refresh_at = dt_util.utcnow()
+            self.last_refresh_duration = time.monotonic() - start
+
+    async def _async_poll_due(self, now: float) -> dict[str, CompanyStatus]:
+        """Fetch the registered services that are due and return the new data."""
+        due = [
+            service_id
+            for service_id, schedule in self._services.items()
+            if schedule.next_poll <= now + POLL_SLACK
+        ]
+        due = self._limit_to_budget(due, now)
+        self.last_refresh_services = len(due)
+        previous = self.data or {}
+
+        if due and (retry_in := self.client.retry_in):
+            # The API host is failing or asked us to back off. Nothing was
+            # attempted, so retry as soon as it may be contacted again.
+            for service_id in due:
+                self._services[service_id].next_poll = now + retry_in
+            self._schedule_next_tick(now)
+            raise UpdateFailed(f"Downdetector API unavailable, retrying in {retry_in:.0f} seconds")
+
+        try:
+            fetched = (
+                await self.client.get_companies_status(
+                    due, {service_id: self._services[service_id].fields for service_id in due}
+                )
+                if due
+                else {}
+            )
+        except Exception as err:
+            self._postpone(due, now)
+            raise UpdateFailed(f"Error communicating with API: {err}") from err
+
+        self._failures = 0
+
+        data = {
+            service_id: status
+            for service_id, status in previous.items()
+            if service_id in self._services and service_id not in due
+        }
+        for service_id in due:
+            schedule = self._services[service_id]
+            if (status := fetched.get(service_id)) is None:
+                schedule.next_poll = now + schedule.base_interval
+                continue
+            schedule.interval = self._next_interval(
+                schedule, previous.get(service_id), status
+            )
+            schedule.next_poll = now + schedule.interval
+            data[service_id] = status
+            self._record_history(service_id, status)
+
+        self._detect_outages(data)
+        self._async_schedule_statistics()
+        self._schedule_next_tick(now)
+        return data
+
+    def diagnostics(self) -> dict[str, Any]:
+        """Return the coordinator's timing and scheduling state."""
+        now = time.monotonic()
+        next_refresh = (
+            self.last_refresh_at + self.update_interval
+            if self.last_refresh_at and self.update_interval
+            else None
+        )
+        return {
+            "last_update_success": self.last_update_success,
+            "last_refresh_at": self.last_refresh_at.isoformat() if self.last_refresh_at else None,
+            "last_refresh_duration": (
+                round(self.last_refresh_duration, 3)
+                if self.last_refresh_duration is not None
+                else None
+            ),
+            "last_refresh_services": self.last_refresh_services,
+            "next_refresh_at": next_refresh.isoformat() if next_refresh else None,
+            "consecutive_failures": self._failures,
+            "services": {
+                service_id: {
+                    # next_poll is on the monotonic clock, shown relative to now
+                    **{key: value for key, value in asdict(schedule).items() if key != "next_poll"},
+                    "next_poll_in": round(max(schedule.next_poll - now, 0), 1),
+                }
+                for service_id, schedule in self._services.items()
+            },
+        }
+
+    def _record_history(self, service_id: str, status: CompanyStatus) -> None:
+        """Record a fetched status in the service's history.
+
+        The status's stats_24 is dropped afterwards, as nothing else uses it.
+        """
+        history = self.histories.get(service_id)
+        stats_24, status.stats_24 = status.stats_24, None
+        if history is None:
+            return
+
+        history.seed(stats_24, status.baseline)
+        if status.current_reports is not None and not status.reports_stale:
+            history.add(status.current_reports, status.baseline)
+
+    def _detect_outages(self, data: dict[str, CompanyStatus]) -> None:
+        """Run outage detection for all services with history in one pass.
+
+        The result is stored in each service's status as its detection.
+        """
+        service_ids = []
+        current = []
+        baseline = []
+        for service_id, status in data.items():
+            if (
+                status.current_reports is None
+                or service_id not in self.histories
+                or service_id not in self._services
+            ):
+                continue
+            service_ids.append(service_id)
+            current.append(status.current_reports)
+            baseline.append(status.baseline)
+
+        detections = detect_outages(
+            service_ids,
+            [self.histories[service_id] for service_id in service_ids],
+            current,
+            baseline,
+            [self._services[service_id].minor_threshold for service_id in service_ids],
+            [self._services[service_id].major_threshold for service_id in service_ids],
+        )
+        for service_id, detection in detections.items():
+            data[service_id].detection = detection
+
+    @callback
+    def _async_schedule_statistics(self) -> None:
+        """Start importing completed hours into long-term statistics.
+
+        Runs once per completed hour, or when a service has been added since
+        the last import, and never concurrently with a running import.
+        """
+        current_hour = int(time.time()) // HOURLY_RESOLUTION * HOURLY_RESOLUTION
+        if self._statistics_task and not self._statistics_task.done():
+            return
+        if (
+            current_hour <= self._statistics_hour
+            and self.histories.keys() <= self._statistics_until.keys()
+        ):
+            return
+
+        self._statistics_hour = current_hour
+        self._statistics_task = self.hass.async_create_task(
+            self._async_import_statistics(current_hour)
+        )
+
+    async def _async_import_statistics(self, current_hour: int) -> None:
+        """Import the hours completed since the last import of each service.
+
+        The latest imported hour is read back from the recorder once per
+        service, so hours imported before a restart are not imported again.
+        """
+        for service_id, history in list(self.histories.items()):
+            if (schedule := self._services.get(service_id)) is None:
+                continue
+            until = self._statistics_until.get(service_id)
+            if until is None:
+                until = await async_get_last_imported(self.hass, service_id) or 0.0
+            hours = [
+                hour
+                for hour in history.hourly_series(since=until + 1)
+                if hour[0] < current_hour
+            ]
+            if hours:
+                async_import_report_statistics(self.hass, service_id, schedule.name, hours)
+                until = hours[-1][0]
+            self._statistics_until[service_id] = until
+
+    def _postpone(self, due: list[str], now: float) -> None:
+        """Reschedule services after a failed pass with jittered backoff.
+
+        The delay grows exponentially with consecutive failures from each
+        service's minimum interval up to its maximum. While the client may
+        not contact the API, e.g. because a circuit breaker opened, services
+        are retried as soon as it may again; the breaker backs off itself.
+        """
+        self._failures += 1
+        retry_in = self.client.retry_in
+        for service_id in due:
+            schedule = self._services[service_id]
+            delay = retry_in or backoff_delay(
+                schedule.min_interval, self._failures, schedule.max_interval
+            )
+            schedule.next_poll = now + delay
+        self._schedule_next_tick(now)
+
+    def _limit_to_budget(self, due: list[str], now: float) -> list[str]:
+        """Return the due services that fit in the remaining daily budget.
+
+        The most urgent services (shortest interval) are kept; the others are
+        postponed by their maximum interval.
+        """
+        remaining = self.client.budget.remaining
+        if remaining is None or self.client.estimate_requests(len(due)) <= remaining:
+            return due
+
+        due = sorted(due, key=lambda service_id: self._services[service_id].interval)
+        count = len(due)
+        while count and self.client.estimate_requests(count) > remaining:
+            count -= 1
+
+        for service_id in due[count:]:
+            schedule = self._services[service_id]
+            schedule.next_poll = now + schedule.max_interval
+        _LOGGER.warning(
+            "Daily request budget nearly used up (%s left), postponing %s of %s services",
+            remaining,
+            len(due) - count,
+            len(due),
+        )
+        return due[:count]
+
+    @staticmethod
+    def _next_interval(
+        schedule: ServiceSchedule,
+        previous: CompanyStatus | None,
+        current: CompanyStatus,
+    ) -> int:
+        """Return the next polling interval of a service from its new status."""
+        status = current.status
+        reports = current.current_reports
+        baseline = current.baseline
+        previous_reports = previous.current_reports if previous else None
+
+        rising = (
+            not current.reports_stale
+            and reports is not None
+            and previous_reports is not None
+            and reports > previous_reports
+            and (baseline is None or reports > baseline)
+        )
+        if status in ("warning", "danger") or rising:
+            return schedule.min_interval
+
+        if (
+            status == "success"
+            and reports is not None
+            and baseline is not None
+            and reports <= baseline
+        ):
+            # Calm: back off gradually towards the ceiling
+            return schedule.clamp(max(schedule.interval, schedule.base_interval) * 2)
+
+        return schedule.base_interval
+
+    def _schedule_next_tick(self, now: float) -> None:
+        """Set the coordinator interval to reach the next due service."""
+        if not self._services:
+            self.update_interval = timedelta(seconds=UPDATE_INTERVAL)
+            return
+        next_poll = min(schedule.next_poll for schedule in self._services.values())
+        self.update_interval = timedelta(seconds=max(next_poll - now, 1))
@@ -0,0 +1,172 @@
+"""Outage detection over the report history of all services."""
+from __future__ import annotations
+
+from dataclasses import dataclass
+import time
+
+import numpy as np
+
+from .const import (
+    DEFAULT_MAJOR_THRESHOLD,
+    DEFAULT_MINOR_THRESHOLD,
+    STATUS_MAJOR_OUTAGE,
+    STATUS_MINOR_OUTAGE,
+    STATUS_OPERATIONAL,
+)
+from .history import NATIVE_RESOLUTION, NATIVE_SLOTS, ReportHistory
+
+WINDOW_SAMPLES = 24  # Latest samples of the last 24 hours the statistics use
+MIN_SAMPLES = 6  # Samples needed before the window is trusted at all
+EWMA_ALPHA = 0.3
+Z_MINOR = 3.0  # Rolling z-score of a minor outage
+Z_MAJOR = 6.0  # Rolling z-score of a major outage
+
+
+@dataclass
+class Detection:
+    """Detected status of one service."""
+
+    status: str
+    confidence: float
+    z_score: float
+    ewma: float
+    rate_of_change: float
+
+
+def _window(
+    histories: list[ReportHistory], now: float
+) -> tuple[np.ndarray, np.ndarray]:
+    """Return the report counts of the native slots before now as a matrix.
+
+    Rows are services, columns the native slots of the 24 hours preceding
+    the current one, oldest first. Slots without a sample are NaN. Also
+    returns, per slot, its rank among the service's samples counted from
+    the newest (1), so a window of the latest samples can be taken whatever
+    the polling interval.
+    """
+    current_slot = int(now) - int(now) % NATIVE_RESOLUTION
+    slot_starts = current_slot - NATIVE_RESOLUTION * np.arange(NATIVE_SLOTS, 0, -1)
+    indices = slot_starts // NATIVE_RESOLUTION % NATIVE_SLOTS
+
+    timestamps = np.empty((len(histories), NATIVE_SLOTS), dtype=np.int64)
+    reports = np.empty((len(histories), NATIVE_SLOTS), dtype=np.float64)
+    for row, history in enumerate(histories):
+        history_ts, history_reports = history.native_buffers()
+        # Zero-copy views of the history's ring buffers
+        timestamps[row] = np.frombuffer(history_ts, dtype=np.int64)[indices]
+        reports[row] = np.frombuffer(history_reports, dtype=np.float32)[indices]
+
+    valid = timestamps == slot_starts
+    rank = np.cumsum(valid[:, ::-1], axis=1)[:, ::-1]
+    return np.where(valid, reports, np.nan), rank
+
+
+def detect_outages(
+    service_ids: list[str],
+    histories: list[ReportHistory],
+    current: list[float],
+    baseline: list[float],
+    minor_threshold: list[float] | None = None,
+    major_threshold: list[float] | None = None,
+    now: float | None = None,
+) -> dict[str, Detection]:
+    """Detect outages for many services in one vectorized pass.
+
+    For each service the current report count is compared with its latest
+    WINDOW_SAMPLES samples of the last 24 hours, so that services polled
+    rarely while calm are judged over a longer span: a rolling z-score against the window mean and standard
+    deviation (floored at Poisson noise, sqrt of the mean), an EWMA of the
+    window, and the rate of change from the latest sample. An outage needs
+    both a high z-score and reports above the threshold multiple of the
+    baseline, so a spike on a normally quiet service is not enough on its
+    own. With too little history, the baseline multiple alone decides.
+
+    The confidence is the probability-like strength of the evidence for the
+    emitted status, scaled towards 0.5 when the window has few samples.
+
+    Args:
+        service_ids: IDs of the services, in row order
+        histories: Report history of each service
+        current: Current report count of each service
+        baseline: Current baseline of each service
+        minor_threshold: Baseline multiple of a minor outage per service
+        major_threshold: Baseline multiple of a major outage per service
+        now: Time of the current sample, defaults to now
+
+    Returns:
+        Detection per service ID
+    """
+    if not service_ids:
+        return {}
+
+    count = len(service_ids)
+    now = time.time() if now is None else now
+    window, rank = _window(histories, now)
+    current_arr = np.asarray(current, dtype=np.float64)
+    baseline_arr = np.maximum(np.asarray(baseline, dtype=np.float64), 1.0)
+    minor = np.asarray(
+        minor_threshold or [DEFAULT_MINOR_THRESHOLD] * count, dtype=np.float64
+    )
+    major = np.asarray(
+        major_threshold or [DEFAULT_MAJOR_THRESHOLD] * count, dtype=np.float64
+    )
+
+    valid = ~np.isnan(window) & (rank <= WINDOW_SAMPLES)
+    samples = valid.sum(axis=1)
+    filled = np.where(valid, window, 0.0)
+    safe_samples = np.maximum(samples, 1)
+
+    mean = filled.sum(axis=1) / safe_samples
+    variance = (np.where(valid, window - mean[:, None], 0.0) ** 2).sum(axis=1) / safe_samples
+    std = np.maximum(np.sqrt(variance), np.sqrt(np.maximum(mean, 1.0)))
+    z_score = np.where(samples > 0, (current_arr - mean) / std, 0.0)
+
+    # EWMA with weights decaying from the newest sample, ignoring gaps
+    weights = (1 - EWMA_ALPHA) ** (rank - 1) * valid
+    weight_sum = weights.sum(axis=1)
+    ewma = np.where(
+        weight_sum > 0,
+        (filled * weights).sum(axis=1) / np.maximum(weight_sum, 1e-12),
+        current_arr,
+    )
+
+    newest = valid & (rank == 1)
+    latest = np.where(
+        samples > 0, np.where(newest, window, 0.0).sum(axis=1), ewma
+    )
+    rate_of_change = (current_arr - latest) / np.maximum(latest, 1.0)
+
+    ratio = current_arr / baseline_arr
+    trusted = samples >= MIN_SAMPLES
+    is_major = (ratio > major) & (~trusted | (z_score >= Z_MAJOR))
+    is_minor = ~is_major & (ratio > minor) & (~trusted | (z_score >= Z_MINOR))
+
+    # Evidence of an outage from the z-score, or the baseline multiple
+    # while the history is too short to trust
+    evidence = np.where(
+        trusted,
+        1 / (1 + np.exp(-(z_score - Z_MINOR))),
+        1 / (1 + np.exp(-4 * (ratio - minor))),
+    )
+    outage = is_major | is_minor
+    strength = np.where(outage, evidence, 1 - evidence)
+    coverage = np.minimum(samples / WINDOW_SAMPLES, 1.0)
+    coverage = np.where(trusted, coverage, 0.5)
+    confidence = 0.5 + (strength - 0.5) * coverage
+
+    statuses = np.where(
+        is_major,
+        STATUS_MAJOR_OUTAGE,
+        np.where(is_minor, STATUS_MINOR_OUTAGE, STATUS_OPERATIONAL),
+    )
+
+    return {
+        service_id: Detection(
+            status=str(statuses[row]),
+            confidence=round(float(confidence[row]), 3),
+            z_score=round(float(z_score[row]), 2),
+            ewma=round(float(ewma[row]), 2),
+            rate_of_change=round(float(rate_of_change[row]), 3),
+        )
+        for row, service_id in enumerate(service_ids)
+    }
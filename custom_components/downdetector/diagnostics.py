@@ -0,0 +1,59 @@
+"""Diagnostics support for Downdetector."""
+from __future__ import annotations
+
+from dataclasses import asdict
+from typing import Any
+
+from homeassistant.components.diagnostics import async_redact_data
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+
+from .api import DowndetectorApiClient
+from .const import (
+    CONF_CLIENT_ID,
+    CONF_CLIENT_SECRET,
+    CONF_SERVICE_ID,
+    DATA_COMPANY_SEARCH,
+    DOMAIN,
+)
+from .coordinator import DowndetectorDataUpdateCoordinator
+
+TO_REDACT = {CONF_CLIENT_ID, CONF_CLIENT_SECRET}
+
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant, entry: ConfigEntry
+) -> dict[str, Any]:
+    """Return diagnostics for a config entry and the hub it belongs to."""
+    data = hass.data[DOMAIN][entry.entry_id]
+    client: DowndetectorApiClient = data["client"]
+    coordinator: DowndetectorDataUpdateCoordinator = data["coordinator"]
+    hub: dict[str, Any] = data["hub"]
+    service_id = entry.data[CONF_SERVICE_ID]
+
+    coordinator_diagnostics = coordinator.diagnostics()
+    service_data = None
+    if status := (coordinator.data or {}).get(service_id):
+        service_data = status.as_dict()
+        if status.detection:
+            service_data["detection"] = asdict(status.detection)
+
+    diagnostics = {
+        "entry": async_redact_data(entry.as_dict(), TO_REDACT),
+        "service": {
+            "schedule": coordinator_diagnostics["services"].get(service_id),
+            "data": service_data,
+        },
+        "hub": {
+            "entries": len(hub["entries"]),
+            "is_owner": hub["owner"] == entry.entry_id,
+            "dedicated_session": hub["session"] is not None,
+            "coordinator": coordinator_diagnostics,
+            "client": client.diagnostics(),
+        },
+        "api": client.metrics.as_dict(),
+    }
+    if search := hass.data[DOMAIN].get(DATA_COMPANY_SEARCH):
+        diagnostics["company_search"] = search.diagnostics()
+
+    return diagnostics
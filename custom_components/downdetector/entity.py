@@ -0,0 +1,154 @@
+"""Base entity for the Downdetector integration."""
+from __future__ import annotations
+
+import time
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import callback
+from homeassistant.helpers.device_registry import DeviceEntryType
+from homeassistant.helpers.entity import DeviceInfo
+from homeassistant.helpers.update_coordinator import CoordinatorEntity
+
+from .api import CompanyStatus
+from .const import (
+    CONF_HEARTBEAT_INTERVAL,
+    CONF_MAJOR_THRESHOLD,
+    CONF_MINOR_THRESHOLD,
+    CONF_SERVICE_ID,
+    CONF_SERVICE_NAME,
+    DEFAULT_MAJOR_THRESHOLD,
+    DEFAULT_MINOR_THRESHOLD,
+    DEFAULT_NAME,
+    DOMAIN,
+    STATUS_MAJOR_OUTAGE,
+    STATUS_MINOR_OUTAGE,
+    STATUS_OPERATIONAL,
+)
+from .coordinator import DowndetectorDataUpdateCoordinator
+
+STATUS_ICONS = {
+    STATUS_MAJOR_OUTAGE: "mdi:web-remove",
+    STATUS_MINOR_OUTAGE: "mdi:web-clock",
+    STATUS_OPERATIONAL: "mdi:web-check",
+}
+
+
+def service_status(
+    data: CompanyStatus,
+    minor_threshold: float = DEFAULT_MINOR_THRESHOLD,
+    major_threshold: float = DEFAULT_MAJOR_THRESHOLD,
+) -> str:
+    """Return the status of a service from its coordinator data."""
+    # Map API status to our status
+    api_status = data.status
+    if api_status == "danger":
+        return STATUS_MAJOR_OUTAGE
+    if api_status == "warning":
+        return STATUS_MINOR_OUTAGE
+    if api_status == "success":
+        return STATUS_OPERATIONAL
+
+    # Fallback to detection over the report history
+    if data.detection:
+        return data.detection.status
+
+    # Fallback to baseline comparison
+    current = data.current_reports or 0
+    baseline = data.baseline
+    if baseline > 0 and current > baseline * major_threshold:
+        return STATUS_MAJOR_OUTAGE
+    if baseline > 0 and current > baseline * minor_threshold:
+        return STATUS_MINOR_OUTAGE
+    return STATUS_OPERATIONAL
+
+
+class DowndetectorEntity(CoordinatorEntity[DowndetectorDataUpdateCoordinator]):
+    """Base class for the entities of one monitored service.
+
+    All entities of a service belong to one device carrying its static
+    metadata. Subclasses compute their state in _update_from_data, once per
+    coordinator update. The state is only written when it differs from the
+    last written one, or when the optional heartbeat interval has passed
+    since the last write.
+    """
+
+    _attr_has_entity_name = True
+
+    def __init__(
+        self,
+        coordinator: DowndetectorDataUpdateCoordinator,
+        entry: ConfigEntry,
+        key: str | None = None,
+    ) -> None:
+        """Initialize the entity.
+
+        Args:
+            coordinator: The hub coordinator
+            entry: The config entry of the service
+            key: Suffix of the unique ID, None for the main entity
+        """
+        super().__init__(coordinator)
+        self.service_id: str = entry.data[CONF_SERVICE_ID]
+        self.service_name: str = entry.data[CONF_SERVICE_NAME]
+        self._entry = entry
+        self._attr_unique_id = f"{DOMAIN}_{self.service_id}"
+        if key:
+            self._attr_unique_id += f"_{key}"
+        self._attr_device_info = DeviceInfo(
+            identifiers={(DOMAIN, self.service_id)},
+            name=self.service_name,
+            manufacturer=DEFAULT_NAME,
+            entry_type=DeviceEntryType.SERVICE,
+        )
+        self._attr_extra_state_attributes = {}
+        self._last_written: tuple | None = None
+        self._last_write_time = 0.0
+        self._update_from_data()
+
+    @property
+    def service_data(self) -> CompanyStatus | None:
+        """Return this service's slice of the hub coordinator data."""
+        if not self.coordinator.data:
+            return None
+        return self.coordinator.data.get(self.service_id)
+
+    def _service_status(self, data: CompanyStatus) -> str:
+        """Return the status of the service with the entry's thresholds."""
+        options = self._entry.options
+        return service_status(
+            data,
+            options.get(CONF_MINOR_THRESHOLD, DEFAULT_MINOR_THRESHOLD),
+            options.get(CONF_MAJOR_THRESHOLD, DEFAULT_MAJOR_THRESHOLD),
+        )
+
+    @property
+    def available(self) -> bool:
+        """Return True if entity is available."""
+        return self.coordinator.last_update_success and self.service_data is not None
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Handle updated data from the coordinator."""
+        self._update_from_data()
+
+        snapshot = (
+            self.available,
+            getattr(self, "_attr_native_value", None),
+            getattr(self, "_attr_is_on", None),
+            self._attr_icon,
+            self._attr_extra_state_attributes,
+        )
+        now = time.monotonic()
+        heartbeat = self._entry.options.get(CONF_HEARTBEAT_INTERVAL, 0)
+        if snapshot == self._last_written and not (
+            heartbeat and now - self._last_write_time >= heartbeat
+        ):
+            return
+
+        self._last_written = snapshot
+        self._last_write_time = now
+        super()._handle_coordinator_update()
+
+    def _update_from_data(self) -> None:
+        """Compute the entity state from the coordinator data."""
+        raise NotImplementedError
@@ -0,0 +1,311 @@
+"""Local report count history for the Downdetector integration."""
+from __future__ import annotations
+
+from array import array
+import base64
+import logging
+import time
+from typing import Any
+
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.storage import Store
+from homeassistant.util import dt as dt_util
+
+from .const import (
+    DOMAIN,
+    HISTORY_SAVE_DELAY,
+    HOURLY_HISTORY_SAVE_DELAY,
+    STORAGE_VERSION,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+NATIVE_RESOLUTION = 300  # Seconds per native slot
+NATIVE_SLOTS = 24 * 3600 // NATIVE_RESOLUTION  # 24 hours
+HOURLY_RESOLUTION = 3600
+HOURLY_SLOTS = 90 * 24  # 90 days
+
+# Array typecodes: slot start timestamps, values, hourly sample counts
+_TS = "q"
+_VALUE = "f"
+_COUNT = "H"
+
+
+def _zeros(typecode: str, size: int) -> array:
+    """Return a zero-filled array."""
+    return array(typecode, bytes(size * array(typecode).itemsize))
+
+
+def _parse_stats_24(stats: Any, now: float) -> list[tuple[float, float]]:
+    """Return (timestamp, reports) samples from a stats_24 payload.
+
+    Accepts a plain list of counts, taken to be evenly spaced over the last
+    24 hours and ending now, or a list of objects carrying a timestamp and a
+    count.
+    """
+    if not isinstance(stats, list) or not stats:
+        return []
+
+    if all(isinstance(value, (int, float)) for value in stats):
+        step = 24 * 3600 / len(stats)
+        return [
+            (now - (len(stats) - 1 - index) * step, float(value))
+            for index, value in enumerate(stats)
+        ]
+
+    samples = []
+    for item in stats:
+        if not isinstance(item, dict):
+            continue
+        timestamp = item.get("timestamp", item.get("date"))
+        reports = item.get("count", item.get("reports", item.get("value")))
+        if isinstance(timestamp, str):
+            try:
+                parsed = dt_util.parse_datetime(timestamp)
+            except ValueError:
+                parsed = None
+            timestamp = parsed.timestamp() if parsed else None
+        if isinstance(timestamp, (int, float)) and isinstance(reports, (int, float)):
+            samples.append((float(timestamp), float(reports)))
+    return samples
+
+
+def _encode(buffers: dict[str, array]) -> dict[str, str]:
+    """Return buffers encoded for storage."""
+    return {
+        name: base64.b64encode(buffer.tobytes()).decode()
+        for name, buffer in buffers.items()
+    }
+
+
+class ReportHistory:
+    """Fixed-memory history of one service's report counts and baseline.
+
+    Two array-backed ring buffers are kept: 5 minute slots for the last 24
+    hours (holding the highest report count seen in the slot and the latest
+    baseline), and hourly buckets for the last 90 days (holding the report
+    sum, sample count and maximum, and the baseline sum). A slot is valid
+    only while its stored start timestamp matches the time it represents, so
+    stale slots never need to be cleared.
+
+    The buffers are persisted per service, the 24 hour and the 90 day
+    buffers in separate stores. A save is scheduled on the first change after
+    the previous save and is not pushed back by later changes, so each store
+    is written at most once per HISTORY_SAVE_DELAY or
+    HOURLY_HISTORY_SAVE_DELAY, and pending saves are flushed on shutdown.
+    """
+
+    def __init__(self, hass: HomeAssistant, service_id: str) -> None:
+        """Initialize an empty history."""
+        self.service_id = service_id
+        self._store: Store = Store(
+            hass, STORAGE_VERSION, f"{DOMAIN}.history.{service_id}"
+        )
+        self._hourly_store: Store = Store(
+            hass, STORAGE_VERSION, f"{DOMAIN}.history_hourly.{service_id}"
+        )
+        self._save_pending = False
+        self._hourly_save_pending = False
+        self._native_ts = _zeros(_TS, NATIVE_SLOTS)
+        self._native_reports = _zeros(_VALUE, NATIVE_SLOTS)
+        self._native_baseline = _zeros(_VALUE, NATIVE_SLOTS)
+        self._hourly_ts = _zeros(_TS, HOURLY_SLOTS)
+        self._hourly_sum = _zeros(_VALUE, HOURLY_SLOTS)
+        self._hourly_count = _zeros(_COUNT, HOURLY_SLOTS)
+        self._hourly_max = _zeros(_VALUE, HOURLY_SLOTS)
+        self._hourly_baseline = _zeros(_VALUE, HOURLY_SLOTS)
+        self._seeded = False
+
+    def _native_buffers(self) -> dict[str, array]:
+        """Return the 24 hour ring buffers by storage name."""
+        return {
+            "native_ts": self._native_ts,
+            "native_reports": self._native_reports,
+            "native_baseline": self._native_baseline,
+        }
+
+    def _hourly_buffers(self) -> dict[str, array]:
+        """Return the 90 day ring buffers by storage name."""
+        return {
+            "hourly_ts": self._hourly_ts,
+            "hourly_sum": self._hourly_sum,
+            "hourly_count": self._hourly_count,
+            "hourly_max": self._hourly_max,
+            "hourly_baseline": self._hourly_baseline,
+        }
+
+    async def async_load(self) -> None:
+        """Load the persisted history, if any."""
+        data = await self._store.async_load() or {}
+        if hourly := await self._hourly_store.async_load():
+            self._restore(self._hourly_buffers(), hourly)
+        elif "hourly_ts" in data:
+            # Saved before the hourly buffers got their own store
+            if self._restore(self._hourly_buffers(), data):
+                self._schedule_hourly_save()
+        if data:
+            self._restore(self._native_buffers(), data)
+
+    def _restore(self, buffers: dict[str, array], data: dict[str, Any]) -> bool:
+        """Restore buffers from stored data, returning whether it was valid."""
+        restored = {}
+        for name, buffer in buffers.items():
+            try:
+                restored[name] = array(buffer.typecode, base64.b64decode(data[name]))
+            except (KeyError, TypeError, ValueError):
+                _LOGGER.warning("Discarding invalid history of %s", self.service_id)
+                return False
+        for name, buffer in buffers.items():
+            if len(restored[name]) == len(buffer):
+                buffer[:] = restored[name]
+        return True
+
+    async def async_save(self) -> None:
+        """Write both stores now, replacing their pending saves."""
+        await self._store.async_save(self._data_to_save())
+        await self._hourly_store.async_save(self._hourly_data_to_save())
+
+    async def async_remove(self) -> None:
+        """Delete the persisted history."""
+        await self._store.async_remove()
+        await self._hourly_store.async_remove()
+
+    def _schedule_save(self) -> None:
+        """Save the 24 hour buffers, unless a save is already pending."""
+        if not self._save_pending:
+            self._save_pending = True
+            self._store.async_delay_save(self._data_to_save, HISTORY_SAVE_DELAY)
+
+    def _schedule_hourly_save(self) -> None:
+        """Save the 90 day buffers, unless a save is already pending."""
+        if not self._hourly_save_pending:
+            self._hourly_save_pending = True
+            self._hourly_store.async_delay_save(
+                self._hourly_data_to_save, HOURLY_HISTORY_SAVE_DELAY
+            )
+
+    def _data_to_save(self) -> dict[str, str]:
+        """Return the 24 hour buffers encoded for storage."""
+        self._save_pending = False
+        return _encode(self._native_buffers())
+
+    def _hourly_data_to_save(self) -> dict[str, str]:
+        """Return the 90 day buffers encoded for storage."""
+        self._hourly_save_pending = False
+        return _encode(self._hourly_buffers())
+
+    def add(
+        self,
+        reports: float,
+        baseline: float | None = None,
+        timestamp: float | None = None,
+    ) -> None:
+        """Record a report count sample."""
+        timestamp = time.time() if timestamp is None else timestamp
+        baseline = baseline or 0.0
+
+        slot_start = int(timestamp) - int(timestamp) % NATIVE_RESOLUTION
+        index = slot_start // NATIVE_RESOLUTION % NATIVE_SLOTS
+        if self._native_ts[index] != slot_start:
+            self._native_ts[index] = slot_start
+            self._native_reports[index] = reports
+        else:
+            self._native_reports[index] = max(self._native_reports[index], reports)
+        self._native_baseline[index] = baseline
+
+        hour_start = int(timestamp) - int(timestamp) % HOURLY_RESOLUTION
+        index = hour_start // HOURLY_RESOLUTION % HOURLY_SLOTS
+        if self._hourly_ts[index] != hour_start:
+            self._reset_hour(index, hour_start)
+        self._add_to_hour(index, reports, baseline)
+
+        self._schedule_save()
+        self._schedule_hourly_save()
+
+    def _reset_hour(self, index: int, hour_start: int) -> None:
+        """Start a new hourly bucket."""
+        self._hourly_ts[index] = hour_start
+        self._hourly_sum[index] = 0
+        self._hourly_count[index] = 0
+        self._hourly_max[index] = 0
+        self._hourly_baseline[index] = 0
+
+    def _add_to_hour(self, index: int, reports: float, baseline: float) -> None:
+        """Add a sample to an hourly bucket."""
+        if self._hourly_count[index] < 0xFFFF:
+            self._hourly_sum[index] += reports
+            self._hourly_count[index] += 1
+            self._hourly_baseline[index] += baseline
+        self._hourly_max[index] = max(self._hourly_max[index], reports)
+
+    def seed(self, stats_24: Any, baseline: float | None = None) -> None:
+        """Fill empty slots from a stats_24 payload.
+
+        Only native slots without samples are written, and seeded samples are
+        only aggregated into hourly buckets that had no samples before, so
+        seeding after a restart fills the gap while Home Assistant was down
+        without double counting. Seeding happens once per history object,
+        on the first status that carries a stats_24 payload.
+        """
+        if self._seeded or stats_24 is None:
+            return
+        self._seeded = True
+
+        baseline = baseline or 0.0
+        seeded_hours: set[int] = set()
+        samples = _parse_stats_24(stats_24, time.time())
+        for timestamp, reports in samples:
+            slot_start = int(timestamp) - int(timestamp) % NATIVE_RESOLUTION
+            index = slot_start // NATIVE_RESOLUTION % NATIVE_SLOTS
+            if self._native_ts[index] == slot_start:
+                continue
+            self._native_ts[index] = slot_start
+            self._native_reports[index] = reports
+            self._native_baseline[index] = baseline
+
+            hour_start = int(timestamp) - int(timestamp) % HOURLY_RESOLUTION
+            index = hour_start // HOURLY_RESOLUTION % HOURLY_SLOTS
+            if self._hourly_ts[index] != hour_start:
+                self._reset_hour(index, hour_start)
+                seeded_hours.add(hour_start)
+            elif hour_start not in seeded_hours:
+                continue
+            self._add_to_hour(index, reports, baseline)
+
+        if samples:
+            self._schedule_save()
+        if seeded_hours:
+            self._schedule_hourly_save()
+
+    def native_buffers(self) -> tuple[array, array]:
+        """Return the native slot timestamp and report count buffers."""
+        return self._native_ts, self._native_reports
+
+    def native_series(self, since: float | None = None) -> list[tuple[int, float, float]]:
+        """Return (timestamp, reports, baseline) at native resolution, oldest first."""
+        oldest = time.time() - NATIVE_SLOTS * NATIVE_RESOLUTION
+        since = oldest if since is None else max(since, oldest)
+        return sorted(
+            (timestamp, self._native_reports[index], self._native_baseline[index])
+            for index, timestamp in enumerate(self._native_ts)
+            if timestamp and timestamp >= since
+        )
+
+    def hourly_series(
+        self, since: float | None = None
+    ) -> list[tuple[int, float, float, float]]:
+        """Return (timestamp, mean, max, mean baseline) per hour, oldest first."""
+        oldest = time.time() - HOURLY_SLOTS * HOURLY_RESOLUTION
+        since = oldest if since is None else max(since, oldest)
+        return sorted(
+            (
+                timestamp,
+                self._hourly_sum[index] / count,
+                self._hourly_max[index],
+                self._hourly_baseline[index] / count,
+            )
+            for index, timestamp in enumerate(self._hourly_ts)
+            if timestamp
+            and timestamp >= since
+            and (count := self._hourly_count[index])
+        )
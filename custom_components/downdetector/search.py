@@ -0,0 +1,175 @@
+"""Cached company search for the Downdetector integration."""
+from __future__ import annotations
+
+import asyncio
+from collections import OrderedDict
+import difflib
+import logging
+import time
+from typing import Any
+
+import aiohttp
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.storage import Store
+
+from .api import DowndetectorApiClient
+from .const import (
+    CATALOG_SAVE_DELAY,
+    DATA_COMPANY_SEARCH,
+    DOMAIN,
+    STORAGE_KEY_COMPANIES,
+    STORAGE_VERSION,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+SEARCH_CACHE_SIZE = 128  # Queries whose results are kept
+SEARCH_CACHE_TTL = 3600  # Seconds search results are reused
+CATALOG_SIZE = 5000  # Companies kept in the persisted catalog
+MAX_LOCAL_RESULTS = 25
+FUZZY_CUTOFF = 0.6
+
+
+def normalize_query(query: str) -> str:
+    """Return a search query in the form used as cache key."""
+    return " ".join(query.casefold().split())
+
+
+def _compact(company: dict[str, Any]) -> dict[str, Any] | None:
+    """Return the fields of a search result the config flow uses."""
+    if company.get("id") is None or not company.get("name"):
+        return None
+    return {
+        "id": company["id"],
+        "name": company["name"],
+        "slug": company.get("slug"),
+    }
+
+
+@callback
+def async_get_company_search(hass: HomeAssistant) -> CompanySearch:
+    """Return the company search shared by all config flows."""
+    domain_data = hass.data.setdefault(DOMAIN, {})
+    if DATA_COMPANY_SEARCH not in domain_data:
+        domain_data[DATA_COMPANY_SEARCH] = CompanySearch(hass)
+    return domain_data[DATA_COMPANY_SEARCH]
+
+
+class CompanySearch:
+    """Company search with a result cache and a persisted company catalog.
+
+    Results are cached per normalized query in an LRU with a TTL, so
+    repeating a search while adding several services costs no request.
+    Every company seen in a result is added to a catalog persisted across
+    restarts. When the API cannot be reached, the catalog is searched
+    locally instead, by prefix, substring and fuzzy name matching.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the search."""
+        self._store: Store = Store(hass, STORAGE_VERSION, STORAGE_KEY_COMPANIES)
+        self._cache: OrderedDict[str, tuple[float, list[dict[str, Any]]]] = OrderedDict()
+        self._catalog: dict[str, dict[str, Any]] | None = None
+        self._load_lock = asyncio.Lock()
+        self.cache_hits = 0
+        self.cache_misses = 0
+
+    async def _async_get_catalog(self) -> dict[str, dict[str, Any]]:
+        """Return the company catalog by ID, loading it once."""
+        async with self._load_lock:
+            if self._catalog is None:
+                stored = await self._store.async_load() or {}
+                self._catalog = {
+                    str(company["id"]): company
+                    for company in stored.get("companies", [])
+                }
+        return self._catalog
+
+    async def async_search(
+        self, client: DowndetectorApiClient, query: str
+    ) -> list[dict[str, Any]]:
+        """Search companies by name.
+
+        Args:
+            client: Client used when the query is not cached
+            query: Search query string
+
+        Returns:
+            Matching companies with their id, name and slug
+        """
+        key = normalize_query(query)
+        now = time.monotonic()
+        if (cached := self._cache.get(key)) and cached[0] > now:
+            self._cache.move_to_end(key)
+            self.cache_hits += 1
+            return cached[1]
+        self.cache_misses += 1
+
+        catalog = await self._async_get_catalog()
+        try:
+            companies = await client.search_companies(query)
+        except (aiohttp.ClientError, asyncio.TimeoutError):
+            if results := self._match(catalog, key):
+                _LOGGER.warning(
+                    "Company search unavailable, using %s companies from the local catalog",
+                    len(results),
+                )
+                return results
+            raise
+
+        results = [record for company in companies if (record := _compact(company))]
+        self._cache[key] = (now + SEARCH_CACHE_TTL, results)
+        self._cache.move_to_end(key)
+        while len(self._cache) > SEARCH_CACHE_SIZE:
+            self._cache.popitem(last=False)
+
+        if results:
+            for record in results:
+                # Re-inserted so the most recently seen companies are kept
+                catalog.pop(str(record["id"]), None)
+                catalog[str(record["id"])] = record
+            while len(catalog) > CATALOG_SIZE:
+                del catalog[next(iter(catalog))]
+            self._store.async_delay_save(
+                lambda: {"companies": list(catalog.values())}, CATALOG_SAVE_DELAY
+            )
+
+        return results
+
+    def diagnostics(self) -> dict[str, Any]:
+        """Return the cache and catalog sizes and the cache hit counts."""
+        return {
+            "cached_queries": len(self._cache),
+            "cache_hits": self.cache_hits,
+            "cache_misses": self.cache_misses,
+            "catalog_companies": len(self._catalog) if self._catalog is not None else None,
+        }
+
+    @staticmethod
+    def _match(
+        catalog: dict[str, dict[str, Any]], key: str
+    ) -> list[dict[str, Any]]:
+        """Return catalog companies matching a normalized query, best first."""
+        names = {normalize_query(company["name"]): company for company in catalog.values()}
+
+        # Rank: name prefix, then word prefix, then substring, then fuzzy
+        ranked: dict[str, int] = {}
+        for name in names:
+            if name.startswith(key):
+                ranked[name] = 0
+            elif any(word.startswith(key) for word in name.split()):
+                ranked[name] = 1
+            elif key in name:
+                ranked[name] = 2
+        matched = sorted(ranked, key=lambda name: (ranked[name], name))
+        if len(matched) < MAX_LOCAL_RESULTS:
+            matched += [
+                name
+                for name in difflib.get_close_matches(
+                    key, list(names), MAX_LOCAL_RESULTS, FUZZY_CUTOFF
+                )
+                if name not in ranked
+            ]
+
+        return [names[name] for name in matched[:MAX_LOCAL_RESULTS]]
@@ -1,35 +1,38 @@
 """Sensor platform for Downdetector integration."""
 from __future__ import annotations
 
-from datetime import timedelta
 import logging
 from typing import Any
 
-from homeassistant.components.sensor import SensorEntity, SensorStateClass
+from homeassistant.components.sensor import (
+    SensorDeviceClass,
+    SensorEntity,
+    SensorStateClass,
+)
 from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import EntityCategory, UnitOfInformation, UnitOfTime
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
-from homeassistant.helpers.update_coordinator import (
-    CoordinatorEntity,
-    DataUpdateCoordinator,
-    UpdateFailed,
-)
+from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
-from .api import DowndetectorApiClient
 from .const import (
     ATTR_BASELINE,
+    ATTR_CONFIDENCE,
     ATTR_CURRENT_REPORTS,
-    ATTR_LAST_UPDATED,
+    ATTR_DAILY_BUDGET,
+    ATTR_REPORTS_STALE,
+    ATTR_REQUESTS_TODAY,
     ATTR_SERVICE_ID,
     ATTR_SERVICE_NAME,
     ATTR_STATUS,
-    CONF_CLIENT_ID,
-    CONF_CLIENT_SECRET,
-    CONF_SERVICE_ID,
-    CONF_SERVICE_NAME,
     DOMAIN,
-    UPDATE_INTERVAL,
+    STATUS_MAJOR_OUTAGE,
+    STATUS_MINOR_OUTAGE,
+    STATUS_OPERATIONAL,
 )
+from .api import ApiMetrics
+from .coordinator import DowndetectorDataUpdateCoordinator
+from .entity import STATUS_ICONS, DowndetectorEntity
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -39,134 +42,288 @@ async def async_setup_entry(
     entry: ConfigEntry,
     async_add_entities: AddEntitiesCallback,
 ) -> None:
-    """Set up Downdetector sensor based on a config entry."""
+    """Set up Downdetector sensors based on a config entry."""
     data = hass.data[DOMAIN][entry.entry_id]
-    client: DowndetectorApiClient = data["client"]
-    service_id: str = entry.data[CONF_SERVICE_ID]
-    service_name: str = entry.data[CONF_SERVICE_NAME]
+    coordinator: DowndetectorDataUpdateCoordinator = data["coordinator"]
+
+    hub = data["hub"]
+
+    def _hub_entities() -> list[SensorEntity]:
+        return [
+            DowndetectorRequestBudgetSensor(coordinator),
+            DowndetectorApiLatencySensor(coordinator),
+            DowndetectorApiRequestsSensor(coordinator),
+            DowndetectorApiDataSensor(coordinator),
+        ]
+
+    entities: list[SensorEntity] = [
+        DowndetectorSensor(coordinator, entry),
+        DowndetectorBaselineSensor(coordinator, entry),
+        DowndetectorStatusSensor(coordinator, entry),
+    ]
+    # One entry of the hub provides the hub-level entities. When it is
+    # unloaded, they are added to another entry through this callback.
+    hub["add_hub_entities"][entry.entry_id] = lambda: async_add_entities(_hub_entities())
+    if hub["owner"] is None:
+        hub["owner"] = entry.entry_id
+    if hub["owner"] == entry.entry_id:
+        entities += _hub_entities()
+
+    async_add_entities(entities)
+
+    # Debounced, so entries set up together share a single hub refresh
+    await coordinator.async_request_refresh()
+
+
+class DowndetectorSensor(DowndetectorEntity, SensorEntity):
+    """Sensor with the current number of reports of a service.
+
+    Its attributes are kept for existing automations but not recorded; the
+    baseline and status are recorded by their own entities, and the static
+    service metadata lives on the device.
+    """
 
-    coordinator = DowndetectorDataUpdateCoordinator(
-        hass, client, service_id, service_name
+    _attr_name = "Status"
+    _attr_native_unit_of_measurement = "reports"
+    _attr_state_class = SensorStateClass.MEASUREMENT
+    _unrecorded_attributes = frozenset(
+        {
+            ATTR_SERVICE_ID,
+            ATTR_SERVICE_NAME,
+            ATTR_CURRENT_REPORTS,
+            ATTR_BASELINE,
+            ATTR_REPORTS_STALE,
+            ATTR_STATUS,
+            ATTR_CONFIDENCE,
+            "company_slug",
+            "company_url",
+        }
     )
 
-    await coordinator.async_config_entry_first_refresh()
+    def _update_from_data(self) -> None:
+        """Compute the state, icon and attributes from the coordinator data."""
+        if not (data := self.service_data):
+            self._attr_native_value = None
+            self._attr_extra_state_attributes = {}
+            return
+
+        status = self._service_status(data)
+        self._attr_native_value = data.current_reports
+        self._attr_icon = STATUS_ICONS[status]
+
+        attrs = {
+            ATTR_SERVICE_ID: self.service_id,
+            ATTR_SERVICE_NAME: self.service_name,
+            ATTR_CURRENT_REPORTS: data.current_reports,
+            ATTR_BASELINE: data.baseline,
+            ATTR_REPORTS_STALE: data.reports_stale,
+            ATTR_STATUS: status,
+            "company_slug": data.slug,
+            "company_url": data.url,
+        }
 
-    async_add_entities([DowndetectorSensor(coordinator, entry)])
+        if data.detection:
+            attrs[ATTR_CONFIDENCE] = data.detection.confidence
 
+        self._attr_extra_state_attributes = attrs
 
-class DowndetectorDataUpdateCoordinator(DataUpdateCoordinator):
-    """Class to manage fetching Downdetector data."""
+
+class DowndetectorBaselineSensor(DowndetectorEntity, SensorEntity):
+    """Sensor with the baseline number of reports of a service."""
+
+    _attr_name = "Baseline"
+    _attr_icon = "mdi:chart-bell-curve"
+    _attr_native_unit_of_measurement = "reports"
+    _attr_state_class = SensorStateClass.MEASUREMENT
 
     def __init__(
-        self,
-        hass: HomeAssistant,
-        client: DowndetectorApiClient,
-        service_id: str,
-        service_name: str,
+        self, coordinator: DowndetectorDataUpdateCoordinator, entry: ConfigEntry
     ) -> None:
-        """Initialize the coordinator."""
-        self.client = client
-        self.service_id = service_id
-        self.service_name = service_name
-
-        super().__init__(
-            hass,
-            _LOGGER,
-            name=f"{DOMAIN}_{service_id}",
-            update_interval=timedelta(seconds=UPDATE_INTERVAL),
-        )
+        """Initialize the sensor."""
+        super().__init__(coordinator, entry, "baseline")
 
-    async def _async_update_data(self) -> dict[str, Any]:
-        """Update data via library."""
-        try:
-            status = await self.client.get_company_status(self.service_id)
-            return status
-        except Exception as err:
-            raise UpdateFailed(f"Error communicating with API: {err}") from err
+    def _update_from_data(self) -> None:
+        """Compute the state from the coordinator data."""
+        data = self.service_data
+        self._attr_native_value = data.baseline if data else None
 
 
-class DowndetectorSensor(CoordinatorEntity, SensorEntity):
-    """Representation of a Downdetector sensor."""
+class DowndetectorStatusSensor(DowndetectorEntity, SensorEntity):
+    """Enum sensor with the outage status of a service."""
+
+    _attr_name = "Outage status"
+    _attr_device_class = SensorDeviceClass.ENUM
+    _attr_options = [STATUS_OPERATIONAL, STATUS_MINOR_OUTAGE, STATUS_MAJOR_OUTAGE]
+    _unrecorded_attributes = frozenset({ATTR_CONFIDENCE})
 
     def __init__(
-        self,
-        coordinator: DowndetectorDataUpdateCoordinator,
-        entry: ConfigEntry,
+        self, coordinator: DowndetectorDataUpdateCoordinator, entry: ConfigEntry
     ) -> None:
+        """Initialize the sensor."""
+        super().__init__(coordinator, entry, "status")
+
+    def _update_from_data(self) -> None:
+        """Compute the state, icon and attributes from the coordinator data."""
+        if not (data := self.service_data):
+            self._attr_native_value = None
+            self._attr_extra_state_attributes = {}
+            return
+
+        status = self._service_status(data)
+        self._attr_native_value = status
+        self._attr_icon = STATUS_ICONS[status]
+        self._attr_extra_state_attributes = (
+            {ATTR_CONFIDENCE: data.detection.confidence} if data.detection else {}
+        )
+
+
+class DowndetectorRequestBudgetSensor(CoordinatorEntity, SensorEntity):
+    """Diagnostic sensor showing the remaining daily request budget of a hub."""
+
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+    _attr_icon = "mdi:counter"
+    _attr_native_unit_of_measurement = "requests"
+    _attr_state_class = SensorStateClass.MEASUREMENT
+
+    def __init__(self, coordinator: DowndetectorDataUpdateCoordinator) -> None:
         """Initialize the sensor."""
         super().__init__(coordinator)
-        self._attr_unique_id = f"{DOMAIN}_{coordinator.service_id}"
-        self._attr_name = f"{coordinator.service_name} Status"
-        self._attr_icon = "mdi:web-check"
-        self._entry = entry
+        self._attr_unique_id = f"{DOMAIN}_{coordinator.client.client_id}_request_budget"
+        self._attr_name = "Downdetector Request Budget"
 
     @property
-    def state(self) -> int | None:
-        """Return the state of the sensor."""
-        if self.coordinator.data:
-            # Return the number of current reports
-            return self.coordinator.data.get("current_reports", 0)
-        return None
+    def native_value(self) -> int | None:
+        """Return the requests left today, or None when unlimited."""
+        return self.coordinator.client.budget.remaining
 
     @property
     def extra_state_attributes(self) -> dict[str, Any]:
         """Return the state attributes."""
-        if not self.coordinator.data:
-            return {}
-
-        attrs = {
-            ATTR_SERVICE_ID: self.coordinator.service_id,
-            ATTR_SERVICE_NAME: self.coordinator.service_name,
-            ATTR_CURRENT_REPORTS: self.coordinator.data.get("current_reports", 0),
-            ATTR_BASELINE: self.coordinator.data.get("baseline", 0),
+        budget = self.coordinator.client.budget
+        return {
+            ATTR_DAILY_BUDGET: budget.limit,
+            ATTR_REQUESTS_TODAY: budget.used,
         }
 
-        # Get status from API or determine based on reports vs baseline
-        api_status = self.coordinator.data.get("status", "unknown")
-        current = self.coordinator.data.get("current_reports", 0)
-        baseline = self.coordinator.data.get("baseline", 0)
-
-        # Map API status to our status
-        if api_status == "danger":
-            attrs[ATTR_STATUS] = "major_outage"
-            self._attr_icon = "mdi:web-remove"
-        elif api_status == "warning":
-            attrs[ATTR_STATUS] = "minor_outage"
-            self._attr_icon = "mdi:web-clock"
-        elif api_status == "success":
-            attrs[ATTR_STATUS] = "operational"
-            self._attr_icon = "mdi:web-check"
-        else:
-            # Fallback to baseline comparison
-            if baseline > 0 and current > baseline * 2:
-                attrs[ATTR_STATUS] = "major_outage"
-                self._attr_icon = "mdi:web-remove"
-            elif baseline > 0 and current > baseline * 1.5:
-                attrs[ATTR_STATUS] = "minor_outage"
-                self._attr_icon = "mdi:web-clock"
-            else:
-                attrs[ATTR_STATUS] = "operational"
-                self._attr_icon = "mdi:web-check"
-
-        # Add company info if available
-        if "company" in self.coordinator.data:
-            company = self.coordinator.data["company"]
-            attrs["company_slug"] = company.get("slug")
-            attrs["company_url"] = company.get("url")
-
-        return attrs
+    @property
+    def available(self) -> bool:
+        """Return True if entity is available."""
+        return True
+
+
+class DowndetectorApiMetricSensor(CoordinatorEntity, SensorEntity):
+    """Base of the diagnostic sensors showing the API metrics of a hub.
+
+    They are disabled by default, and their per-endpoint attributes are not
+    recorded.
+    """
+
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+    _attr_entity_registry_enabled_default = False
+    _unrecorded_attributes = frozenset({"endpoints"})
+
+    def __init__(
+        self, coordinator: DowndetectorDataUpdateCoordinator, key: str, name: str
+    ) -> None:
+        """Initialize the sensor."""
+        super().__init__(coordinator)
+        self._attr_unique_id = f"{DOMAIN}_{coordinator.client.client_id}_{key}"
+        self._attr_name = name
+
+    @property
+    def metrics(self) -> ApiMetrics:
+        """Return the metrics of the hub's API client."""
+        return self.coordinator.client.metrics
 
     @property
     def available(self) -> bool:
         """Return True if entity is available."""
-        return self.coordinator.last_update_success
+        return True
+
+
+class DowndetectorApiLatencySensor(DowndetectorApiMetricSensor):
+    """Diagnostic sensor with the 95th percentile API request latency."""
+
+    _attr_device_class = SensorDeviceClass.DURATION
+    _attr_icon = "mdi:timer-outline"
+    _attr_native_unit_of_measurement = UnitOfTime.MILLISECONDS
+    _attr_state_class = SensorStateClass.MEASUREMENT
+
+    def __init__(self, coordinator: DowndetectorDataUpdateCoordinator) -> None:
+        """Initialize the sensor."""
+        super().__init__(coordinator, "api_latency", "Downdetector API Latency")
 
     @property
-    def state_class(self) -> SensorStateClass | None:
-        """Return the state class of this entity."""
-        return SensorStateClass.MEASUREMENT
+    def native_value(self) -> float:
+        """Return the worst endpoint's 95th percentile latency."""
+        return round(self.metrics.percentile(95) * 1000, 1)
 
     @property
-    def native_unit_of_measurement(self) -> str:
-        """Return the unit of measurement."""
-        return "reports"
+    def extra_state_attributes(self) -> dict[str, Any]:
+        """Return the state attributes."""
+        return {
+            "endpoints": {
+                name: {
+                    "requests": endpoint.requests,
+                    "p50_ms": round(endpoint.percentile(50) * 1000, 1),
+                    "p95_ms": round(endpoint.percentile(95) * 1000, 1),
+                    "max_ms": round(endpoint.latency_max * 1000, 1),
+                }
+                for name, endpoint in self.metrics.endpoints.items()
+            }
+        }
+
+
+class DowndetectorApiRequestsSensor(DowndetectorApiMetricSensor):
+    """Diagnostic sensor with the API requests made since startup."""
+
+    _attr_icon = "mdi:swap-horizontal"
+    _attr_native_unit_of_measurement = "requests"
+    _attr_state_class = SensorStateClass.TOTAL_INCREASING
+
+    def __init__(self, coordinator: DowndetectorDataUpdateCoordinator) -> None:
+        """Initialize the sensor."""
+        super().__init__(coordinator, "api_requests", "Downdetector API Requests")
+
+    @property
+    def native_value(self) -> int:
+        """Return the requests made over all endpoints."""
+        return self.metrics.requests
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any]:
+        """Return the state attributes."""
+        metrics = self.metrics
+        return {
+            "unauthorized_retries": metrics.unauthorized_retries,
+            "throttled_retries": metrics.throttled_retries,
+            "token_requests": metrics.token_requests,
+            "token_wait_max_ms": round(metrics.token_wait_max * 1000, 1),
+            "endpoints": {
+                name: dict(endpoint.statuses)
+                for name, endpoint in metrics.endpoints.items()
+            },
+        }
+
+
+class DowndetectorApiDataSensor(DowndetectorApiMetricSensor):
+    """Diagnostic sensor with the API response data received since startup."""
+
+    _attr_device_class = SensorDeviceClass.DATA_SIZE
+    _attr_icon = "mdi:download-network"
+    _attr_native_unit_of_measurement = UnitOfInformation.BYTES
+    _attr_state_class = SensorStateClass.TOTAL_INCREASING
+
+    def __init__(self, coordinator: DowndetectorDataUpdateCoordinator) -> None:
+        """Initialize the sensor."""
+        super().__init__(coordinator, "api_data", "Downdetector API Data Received")
+
+    @property
+    def native_value(self) -> int:
+        """Return the decoded response bytes received."""
+        return self.metrics.bytes_received
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any]:
+        """Return the state attributes."""
+        return {"json_decode_ms": round(self.metrics.decode_time * 1000, 1)}
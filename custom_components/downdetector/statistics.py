@@ -0,0 +1,77 @@
+"""Long-term statistics of the report history."""
+from __future__ import annotations
+
+from datetime import datetime
+import logging
+
+from homeassistant.components.recorder import get_instance
+from homeassistant.components.recorder.models import StatisticData, StatisticMetaData
+from homeassistant.components.recorder.statistics import (
+    async_add_external_statistics,
+    get_last_statistics,
+)
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.util import dt as dt_util, slugify
+
+from .const import DOMAIN
+
+_LOGGER = logging.getLogger(__name__)
+
+
+def statistic_id(service_id: str) -> str:
+    """Return the external statistic ID of a service's report counts."""
+    return f"{DOMAIN}:reports_{slugify(service_id)}"
+
+
+async def async_get_last_imported(hass: HomeAssistant, service_id: str) -> float | None:
+    """Return the start of the latest hour imported for a service, if any."""
+    last = await get_instance(hass).async_add_executor_job(
+        get_last_statistics, hass, 1, statistic_id(service_id), True, {"max"}
+    )
+    if not (rows := last.get(statistic_id(service_id))):
+        return None
+
+    start = rows[0]["start"]
+    # Older recorders return the start as a datetime
+    return start.timestamp() if isinstance(start, datetime) else float(start)
+
+
+@callback
+def async_import_report_statistics(
+    hass: HomeAssistant,
+    service_id: str,
+    service_name: str,
+    hours: list[tuple[int, float, float, float]],
+) -> None:
+    """Import hourly report statistics in one batch.
+
+    Args:
+        hass: Home Assistant instance
+        service_id: The service the hours belong to
+        service_name: Display name of the service
+        hours: (timestamp, mean, max, mean baseline) per complete hour
+    """
+    metadata = StatisticMetaData(
+        has_mean=True,
+        has_sum=False,
+        name=f"{service_name} reports",
+        source=DOMAIN,
+        statistic_id=statistic_id(service_id),
+        unit_of_measurement="reports",
+    )
+    statistics = [
+        StatisticData(
+            start=dt_util.utc_from_timestamp(timestamp),
+            mean=mean,
+            max=maximum,
+        )
+        for timestamp, mean, maximum, _ in hours
+    ]
+    async_add_external_statistics(hass, metadata, statistics)
+    _LOGGER.debug("Imported %s hours of statistics for %s", len(statistics), service_id)
+
+
+@callback
+def async_clear_report_statistics(hass: HomeAssistant, service_id: str) -> None:
+    """Delete the imported statistics of a service."""
+    get_instance(hass).async_clear_statistics([statistic_id(service_id)])
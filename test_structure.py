@@ -21,7 +21,10 @@ def test_file_structure():
         "config_flow.py": "Configuration flow",
         "const.py": "Constants",
         "sensor.py": "Sensor platform",
+        "binary_sensor.py": "Binary sensor platform",
+        "entity.py": "Base entity",
         "api.py": "API client",
+        "coordinator.py": "Data update coordinator",
         "strings.json": "UI strings",
     }
     
@@ -182,8 +185,12 @@ def test_sensor_properties():
         print("✓ DowndetectorSensor class found")
         
         # Check for coordinator class
+        coordinator_path = sensor_path.parent / "coordinator.py"
+        with open(coordinator_path) as f:
+            coordinator_tree = ast.parse(f.read())
+
         coordinator_class = None
-        for node in ast.walk(tree):
+        for node in ast.walk(coordinator_tree):
             if isinstance(node, ast.ClassDef) and node.name == "DowndetectorDataUpdateCoordinator":
                 coordinator_class = node
                 break
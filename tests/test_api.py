@@ -0,0 +1,52 @@
+"""Tests for the Downdetector API helpers."""
+import json
+
+import pytest
+
+pytest.importorskip("pytest_homeassistant_custom_component")
+
+from custom_components.downdetector.api import iter_json_array
+
+
+async def _decode(body: bytes, chunk_size: int) -> list:
+    """Return the items of body decoded from chunks of chunk_size bytes."""
+
+    async def _chunks():
+        for start in range(0, len(body), chunk_size):
+            yield body[start:start + chunk_size]
+
+    return [item async for item in iter_json_array(_chunks(), json.JSONDecoder())]
+
+
+@pytest.mark.parametrize("chunk_size", [1, 2, 3, 7, 1000])
+@pytest.mark.parametrize(
+    "items",
+    [
+        [],
+        [12, 3.5, -1e3, 0],
+        [{"id": 1, "name": "Ünïcödé ✓"}, {"id": 22, "name": "Other"}],
+        ["a, b]", None, True, False, [1, [2]]],
+    ],
+)
+async def test_split_chunks(items: list, chunk_size: int) -> None:
+    """Test items are decoded the same however the body is split."""
+    body = json.dumps(items, ensure_ascii=False).encode()
+
+    assert await _decode(body, chunk_size) == items
+
+
+@pytest.mark.parametrize("chunk_size", [1, 1000])
+async def test_whitespace(chunk_size: int) -> None:
+    """Test whitespace around items and separators is skipped."""
+    assert await _decode(b' \n[ 1 ,\t2\r\n, 3 ] ', chunk_size) == [1, 2, 3]
+
+
+@pytest.mark.parametrize("chunk_size", [1, 1000])
+@pytest.mark.parametrize(
+    "body",
+    [b"", b'{"id": 1}', b"[1 2]", b"[1,", b"[1", b"[1,,2]", b"[,1]", b"[1,]", b"[1.]", b'["a'],
+)
+async def test_invalid(body: bytes, chunk_size: int) -> None:
+    """Test a body that is not a complete JSON array raises ValueError."""
+    with pytest.raises(ValueError):
+        await _decode(body, chunk_size)
@@ -0,0 +1,107 @@
+"""Tests for the Downdetector outage detection."""
+import time
+
+import pytest
+
+pytest.importorskip("pytest_homeassistant_custom_component")
+
+from homeassistant.core import HomeAssistant
+
+from custom_components.downdetector.const import (
+    STATUS_MAJOR_OUTAGE,
+    STATUS_MINOR_OUTAGE,
+    STATUS_OPERATIONAL,
+)
+from custom_components.downdetector.detection import MIN_SAMPLES, detect_outages
+from custom_components.downdetector.history import ReportHistory
+
+
+def _history(
+    hass: HomeAssistant, reports: list[float], interval: float, now: float
+) -> ReportHistory:
+    """Return a history with reports sampled every interval up to now, oldest first."""
+    history = ReportHistory(hass, "123")
+    for age, count in enumerate(reversed(reports), start=1):
+        history.add(count, 10, now - age * interval)
+    return history
+
+
+async def test_calm_service(hass: HomeAssistant) -> None:
+    """Test a calm service is operational with high confidence."""
+    now = time.time()
+    history = _history(hass, [10, 11, 9, 10] * 6, 300, now)
+
+    detection = detect_outages(["123"], [history], [10], [10], now=now)["123"]
+
+    assert detection.status == STATUS_OPERATIONAL
+    assert detection.confidence > 0.9
+
+
+async def test_spike(hass: HomeAssistant) -> None:
+    """Test a spike above the baseline multiple is a major outage."""
+    now = time.time()
+    history = _history(hass, [10, 11, 9, 10] * 6, 300, now)
+
+    detection = detect_outages(["123"], [history], [100], [10], now=now)["123"]
+
+    assert detection.status == STATUS_MAJOR_OUTAGE
+    assert detection.z_score > 6
+    assert detection.rate_of_change == 9
+    assert detection.confidence > 0.9
+
+
+async def test_rarely_polled_service_uses_history(hass: HomeAssistant) -> None:
+    """Test a service polled every 30 minutes still has a trusted window."""
+    now = time.time()
+    history = _history(hass, [10, 11, 9, 10] * 12, 1800, now)
+
+    calm = detect_outages(["123"], [history], [10], [10], now=now)["123"]
+    spike = detect_outages(["123"], [history], [100], [10], now=now)["123"]
+
+    assert calm.status == STATUS_OPERATIONAL
+    assert calm.confidence > 0.9
+    assert spike.status == STATUS_MAJOR_OUTAGE
+    assert spike.z_score > 6
+
+
+async def test_noisy_service_needs_high_z_score(hass: HomeAssistant) -> None:
+    """Test reports above the baseline multiple within normal noise are no outage."""
+    now = time.time()
+    history = _history(hass, [5, 60] * 12, 300, now)
+
+    detection = detect_outages(["123"], [history], [40], [10], now=now)["123"]
+
+    assert detection.status == STATUS_OPERATIONAL
+
+
+async def test_short_history_uses_baseline_multiple(hass: HomeAssistant) -> None:
+    """Test the baseline multiple alone decides without enough history."""
+    now = time.time()
+    history = _history(hass, [10] * (MIN_SAMPLES - 1), 300, now)
+
+    detections = detect_outages(
+        ["minor", "major"], [history, history], [16, 25], [10, 10], now=now
+    )
+
+    assert detections["minor"].status == STATUS_MINOR_OUTAGE
+    assert detections["major"].status == STATUS_MAJOR_OUTAGE
+    assert detections["major"].confidence < 0.9
+
+
+async def test_thresholds_per_service(hass: HomeAssistant) -> None:
+    """Test each service is judged with its own baseline multiples."""
+    now = time.time()
+    history = _history(hass, [10] * (MIN_SAMPLES - 1), 300, now)
+
+    detections = detect_outages(
+        ["default", "relaxed"],
+        [history, history],
+        [25, 25],
+        [10, 10],
+        minor_threshold=[1.5, 3.0],
+        major_threshold=[2.0, 5.0],
+        now=now,
+    )
+
+    assert detections["default"].status == STATUS_MAJOR_OUTAGE
+    assert detections["relaxed"].status == STATUS_OPERATIONAL
@@ -0,0 +1,82 @@
+"""Tests for the Downdetector diagnostics."""
+import pytest
+
+pytest.importorskip("pytest_homeassistant_custom_component")
+
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.aiohttp_client import async_get_clientsession
+from homeassistant.util import dt as dt_util
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.downdetector.api import DowndetectorApiClient
+from custom_components.downdetector.const import (
+    CONF_CLIENT_ID,
+    CONF_CLIENT_SECRET,
+    CONF_SERVICE_ID,
+    CONF_SERVICE_NAME,
+    DOMAIN,
+)
+from custom_components.downdetector.coordinator import DowndetectorDataUpdateCoordinator
+from custom_components.downdetector.diagnostics import (
+    async_get_config_entry_diagnostics,
+)
+
+
+@pytest.fixture
+def coordinator(hass: HomeAssistant) -> DowndetectorDataUpdateCoordinator:
+    """Return a coordinator polling one service."""
+    client = DowndetectorApiClient(async_get_clientsession(hass), "client-id", "secret")
+    coordinator = DowndetectorDataUpdateCoordinator(hass, client)
+    coordinator.async_add_service("123", "Example", {})
+    return coordinator
+
+
+async def test_coordinator_diagnostics(
+    coordinator: DowndetectorDataUpdateCoordinator,
+) -> None:
+    """Test the refresh timing and service schedules are reported."""
+    coordinator.last_refresh_at = dt_util.utcnow()
+    coordinator.last_refresh_duration = 0.1234
+
+    diagnostics = coordinator.diagnostics()
+
+    assert diagnostics["last_refresh_at"] == coordinator.last_refresh_at.isoformat()
+    assert diagnostics["last_refresh_duration"] == 0.123
+    assert diagnostics["next_refresh_at"] == (
+        coordinator.last_refresh_at + coordinator.update_interval
+    ).isoformat()
+    service = diagnostics["services"]["123"]
+    assert service["name"] == "Example"
+    assert service["next_poll_in"] == 0
+    assert "next_poll" not in service
+
+
+async def test_config_entry_diagnostics(
+    hass: HomeAssistant, coordinator: DowndetectorDataUpdateCoordinator
+) -> None:
+    """Test the entry diagnostics include the hub and redact the credentials."""
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        data={
+            CONF_CLIENT_ID: "client-id",
+            CONF_CLIENT_SECRET: "secret",
+            CONF_SERVICE_ID: "123",
+            CONF_SERVICE_NAME: "Example",
+        },
+    )
+    entry.add_to_hass(hass)
+    hass.data[DOMAIN] = {
+        entry.entry_id: {
+            "client": coordinator.client,
+            "coordinator": coordinator,
+            "hub": {"entries": {entry.entry_id}, "owner": entry.entry_id, "session": None},
+        }
+    }
+
+    diagnostics = await async_get_config_entry_diagnostics(hass, entry)
+
+    assert diagnostics["entry"]["data"][CONF_CLIENT_SECRET] == "**REDACTED**"
+    assert diagnostics["service"]["schedule"]["name"] == "Example"
+    assert diagnostics["service"]["data"] is None
+    assert diagnostics["hub"]["is_owner"]
+    assert diagnostics["hub"]["coordinator"]["services"].keys() == {"123"}
@@ -0,0 +1,82 @@
+"""Tests for the Downdetector report history."""
+import time
+
+import pytest
+
+pytest.importorskip("pytest_homeassistant_custom_component")
+
+from homeassistant.core import HomeAssistant
+
+from custom_components.downdetector.history import (
+    HOURLY_RESOLUTION,
+    NATIVE_RESOLUTION,
+    NATIVE_SLOTS,
+    ReportHistory,
+)
+
+
+def _hour_start(timestamp: float) -> int:
+    """Return the start of the hour of a timestamp."""
+    return int(timestamp) - int(timestamp) % HOURLY_RESOLUTION
+
+
+async def test_add_keeps_slot_maximum(hass: HomeAssistant) -> None:
+    """Test samples in one native slot keep the highest count."""
+    history = ReportHistory(hass, "123")
+    start = _hour_start(time.time()) - HOURLY_RESOLUTION
+
+    history.add(5, 2, start)
+    history.add(9, 2, start + 60)
+    history.add(3, 2, start + 120)
+
+    assert history.native_series() == [(start, 9, 2)]
+
+
+async def test_add_aggregates_hours(hass: HomeAssistant) -> None:
+    """Test every sample is aggregated into its hourly bucket."""
+    history = ReportHistory(hass, "123")
+    start = _hour_start(time.time()) - HOURLY_RESOLUTION
+
+    history.add(5, 2, start)
+    history.add(9, 4, start + NATIVE_RESOLUTION)
+    history.add(4, 6, start + 2 * NATIVE_RESOLUTION)
+
+    assert history.hourly_series() == [(start, 6, 9, 4)]
+
+
+async def test_seed_fills_empty_slots_once(hass: HomeAssistant) -> None:
+    """Test seeding keeps recorded samples and only happens once."""
+    history = ReportHistory(hass, "123")
+    now = time.time()
+    history.add(50, 2, now)
+
+    history.seed([1] * NATIVE_SLOTS, 2)
+    history.seed([7] * NATIVE_SLOTS, 2)
+
+    series = history.native_series()
+    assert len(series) == NATIVE_SLOTS
+    assert series[-1][1] == 50
+    assert {reports for _, reports, _ in series[:-1]} == {1}
+
+
+async def test_seed_skips_hours_with_samples(hass: HomeAssistant) -> None:
+    """Test seeded samples are not added to hours that already had samples."""
+    history = ReportHistory(hass, "123")
+    now = time.time()
+    history.add(50, 2, now)
+
+    history.seed([1] * NATIVE_SLOTS, 2)
+
+    hours = {timestamp: (mean, maximum) for timestamp, mean, maximum, _ in history.hourly_series()}
+    assert hours[_hour_start(now)] == (50, 50)
+    assert hours[_hour_start(now) - HOURLY_RESOLUTION] == (1, 1)
+
+
+async def test_seed_ignores_invalid_payload(hass: HomeAssistant) -> None:
+    """Test a payload that is not a list of counts or samples is ignored."""
+    history = ReportHistory(hass, "123")
+
+    history.seed({"unexpected": True}, 2)
+    history.seed(["a", None], 2)
+
+    assert history.native_series() == []
@@ -21,7 +21,10 @@ def validate_integration():
         "config_flow.py",
         "const.py",
         "sensor.py",
+        "binary_sensor.py",
+        "entity.py",
         "api.py",
+        "coordinator.py",
         "strings.json",
     ]
     